@@ -0,0 +1,77 @@
+"""table#mydata çıkarıcısı için benchmark: BeautifulSoup yolu vs lxml hızlı yolu.
+
+Kullanım:
+    python bench/bench_mydata.py [--fixtures bench/fixtures/netler-tablo] [--repeat 3]
+
+Fixture klasöründe *.html yoksa sentetik netler-tablo sayfaları kullanılır.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yokatlas_common import parsing  # noqa: E402
+
+from synthetic import netler_tablo_page  # noqa: E402
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'netler-tablo')
+
+
+def load_pages(fixture_dir, synthetic_count):
+    paths = sorted(glob.glob(os.path.join(fixture_dir, '*.html')))
+    if paths:
+        pages = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                pages.append(f.read())
+        return pages, f"{len(pages)} fixture sayfası ({fixture_dir})"
+    pages = [netler_tablo_page(10000 + i) for i in range(synthetic_count)]
+    return pages, f"{len(pages)} sentetik sayfa"
+
+
+def time_it(func, pages, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            func(page)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES)
+    parser.add_argument('--synthetic', type=int, default=30, help="fixture yoksa üretilecek sayfa sayısı")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pages, source = load_pages(args.fixtures, args.synthetic)
+    size_mb = sum(len(p) for p in pages) / 1e6
+    print(f"Girdi: {source}, {size_mb:.1f} MB")
+
+    # İki yolun aynı sonucu verdiğini doğrula
+    for page in pages:
+        if parsing._extract_mydata_lxml(page, 'utf-8') != parsing._extract_mydata_bs4(page):
+            print("UYARI: lxml ve bs4 çıktıları farklı!")
+            break
+
+    cases = [
+        ('bs4 (html.parser)', parsing._extract_mydata_bs4),
+        ('lxml', lambda page: parsing._extract_mydata_lxml(page, 'utf-8')),
+        ('parse_netler_table', parsing.parse_netler_table),
+    ]
+    results = {name: time_it(func, pages, args.repeat) for name, func in cases}
+
+    baseline = results['bs4 (html.parser)']
+    for name, elapsed in results.items():
+        print(f"{name:<22} {elapsed:8.3f} s  {len(pages) / elapsed:8.1f} sayfa/s  x{baseline / elapsed:5.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+"""Uçtan uca benchmark: indirme, ayrıştırma, normalizasyon ve yazma aşamaları ayrı ayrı.
+
+Kullanım:
+    python bench/bench_pipeline.py [--fixtures bench/fixtures] [--pages 40] [--repeat 3]
+                                   [--concurrency 8] [--latency 0.0]
+                                   [--out bench/results] [--baseline eski.json] [--tolerance 0.2]
+
+Fixture'lar bench/standin_server.py ile yerel bir sunucudan verilir; kaydı olmayan
+netler-tablo ve 1000_1 sayfaları sentetik üretilir. Ayrıştırma aşamaları sayfaları
+geçici bir yanıt önbelleğinden okur (ağ yok). Her aşama için süre, sayfa/s, satır/s,
+tracemalloc ile ayrılan en yüksek bellek ve o ana kadarki en yüksek RSS ölçülür;
+sonuçlar JSON olarak yazılır. --baseline verilirse önceki sonuçla karşılaştırılır ve
+`tolerance` oranından fazla yavaşlayan aşama varsa çıkış kodu 1 olur.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic import netler_tablo_page, university_details_page  # noqa: E402
+
+DEFAULT_FIXTURES = os.path.join(BENCH_DIR, 'fixtures')
+DEFAULT_OUT = os.path.join(BENCH_DIR, 'results')
+
+
+def load_script(filename, name):
+    """Tire içeren betik dosyasını modül olarak yükler (çıktısı bastırılır)"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(REPO_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+
+def load_fixture_pages(fixture_dir, page, synthetic, count):
+    """{istek yolu: içerik}; fixture yoksa sentetik sayfalar"""
+    index_path = os.path.join(fixture_dir, 'index.json')
+    pages = {}
+    if os.path.exists(index_path):
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+        for request_path, entry in sorted(index.items()):
+            if entry['file'].startswith(page + os.sep) or entry['file'].startswith(page + '/'):
+                with open(os.path.join(fixture_dir, entry['file']), 'rb') as f:
+                    pages[request_path] = f.read()
+    if pages:
+        return dict(list(pages.items())[:count]), 'fixture'
+    return synthetic(count), 'sentetik'
+
+
+def synthetic_netler(count):
+    return {f'/netler-tablo.php?b={100000 + i}': netler_tablo_page(100000 + i) for i in range(count)}
+
+
+def synthetic_universities(count):
+    return {f'/content/lisans-dynamic/1000_1.php?y={200000000 + i}': university_details_page(200000000 + i)
+            for i in range(count)}
+
+
+def measure(func, repeat):
+    """func() -> (sayfa, satır); en iyi süre + tek tur tracemalloc ölçümü"""
+    best = None
+    pages = rows = 0
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            pages, rows = func()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'seconds': round(best, 4),
+        'pages': pages,
+        'rows': rows,
+        'pages_per_s': round(pages / best, 1) if best and pages else None,
+        'rows_per_s': round(rows / best, 1) if best and rows else None,
+        'alloc_peak_mb': round(alloc_peak / 1e6, 2),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['stages']
+    regressions = []
+    print(f"\nKarşılaştırma: {baseline_path}")
+    for name, result in results.items():
+        if name not in baseline or not baseline[name]['seconds']:
+            continue
+        ratio = result['seconds'] / baseline[name]['seconds']
+        flag = ''
+        if ratio > 1 + tolerance:
+            flag = '  ⚠️ YAVAŞLADI'
+            regressions.append(name)
+        print(f"  {name:<20} x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES)
+    parser.add_argument('--pages', type=int, default=40, help="aşama başına en fazla sayfa")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.0, help="yerel sunucu gecikmesi (saniye)")
+    parser.add_argument('--port', type=int, default=8799)
+    parser.add_argument('--out', default=DEFAULT_OUT)
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    fixtures = os.path.abspath(args.fixtures)
+    out_dir = os.path.abspath(args.out)
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+
+    # Betikler yerel sunucuya yönlensin; çıktılar ve önbellek geçici klasöre yazılsın
+    base_url = f'http://127.0.0.1:{args.port}'
+    os.environ['YOKATLAS_BASE_URL'] = base_url
+    workdir = tempfile.mkdtemp(prefix='yokatlas-bench-')
+    os.chdir(workdir)
+
+    import pandas as pd
+    from standin_server import StandinServer
+    from yokatlas_common.aio import fetch_all, run_sync
+    from yokatlas_common.cache import get_cache
+    from yokatlas_common.normalize import LISANS_SCHEMA, normalize_frame
+    from yokatlas_common.parsing import parse_netler_table
+    from yokatlas_common.ratelimit import RateLimiter
+
+    netler = load_script('yokatlas-lisans-netler.py', 'lisans_netler')
+    eskiler = load_script('yokatlas-eskiler.py', 'eskiler')
+    scraper = netler.YokAtlasNetScraper()
+
+    netler_pages, netler_source = load_fixture_pages(fixtures, 'netler-tablo', synthetic_netler, args.pages)
+    university_pages, university_source = load_fixture_pages(fixtures, '1000_1', synthetic_universities, args.pages)
+    print(f"netler-tablo: {len(netler_pages)} {netler_source} sayfa, "
+          f"1000_1: {len(university_pages)} {university_source} sayfa")
+
+    # Ayrıştırma aşamaları sayfaları önbellekten okur
+    cache = get_cache()
+    for request_path, content in {**netler_pages, **university_pages}.items():
+        cache.store(base_url + request_path, 200, {'Content-Type': 'text/html; charset=utf-8'}, content)
+
+    server = StandinServer(('127.0.0.1', args.port), fixtures, latency=args.latency, synthetic=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    netler_items = list(netler_pages.items())
+    codes = [path.split('b=')[1] for path, _ in netler_items]
+    parsed_tables = [parse_netler_table(content) for _, content in netler_items]
+    with contextlib.redirect_stdout(io.StringIO()):
+        frames = [scraper.build_program_frame(parsed, code, f'Program {code}')
+                  for parsed, code in zip(parsed_tables, codes)]
+        program_data = {path: eskiler.get_program_data(base_url + path) for path, _ in netler_items}
+    frames = [df for df in frames if df is not None]
+    combined = pd.concat(frames, ignore_index=True, sort=False)
+    # normalize aşaması için sayfadaki metin hücreleriyle aynı ham tablolar
+    raw_frames = [pd.DataFrame([row[:len(headers)] + ('',) * (len(headers) - len(row)) for row in rows],
+                               columns=headers)
+                  for headers, rows in filter(None, parsed_tables)]
+
+    def stage_fetch():
+        urls = [base_url + path for path in netler_pages]
+        limiter = RateLimiter(rate=10_000, burst=10_000)
+        previous = os.environ.get('YOKATLAS_CACHE')
+        os.environ['YOKATLAS_CACHE'] = '0'
+        try:
+            async def drain():
+                count = 0
+                async for _, status, _, _ in fetch_all(urls, args.concurrency, limiter=limiter):
+                    count += status == 200
+                return count
+            return run_sync(drain()), 0
+        finally:
+            if previous is None:
+                os.environ.pop('YOKATLAS_CACHE')
+            else:
+                os.environ['YOKATLAS_CACHE'] = previous
+
+    def stage_netler_parse():
+        tables = [parse_netler_table(content) for _, content in netler_items]
+        return len(tables), sum(len(table[1]) for table in tables if table)
+
+    def stage_netler_frame():
+        built = [scraper.build_program_frame(parsed, code, f'Program {code}')
+                 for parsed, code in zip(parsed_tables, codes)]
+        return len(built), sum(len(df) for df in built if df is not None)
+
+    def stage_normalize():
+        normalized = [normalize_frame(df, LISANS_SCHEMA) for df in raw_frames]
+        return len(normalized), sum(len(df) for df in normalized)
+
+    def stage_get_program_data():
+        results = [eskiler.get_program_data(base_url + path) for path, _ in netler_items]
+        return len(results), sum(len(rows) for _, rows in results)
+
+    def stage_university_details():
+        details = [eskiler.get_university_details((path.split('y=')[1], 'Program'))
+                   for path in university_pages]
+        return len(details), sum(1 for d in details if d)
+
+    def stage_save_to_csv():
+        scraper.save_to_csv(frames, 'bench_netler.csv')
+        return len(frames), len(combined)
+
+    def stage_save_to_parquet():
+        scraper.save_to_parquet(frames, 'bench_parquet')
+        return len(frames), len(combined)
+
+    def stage_save_to_excel():
+        scraper.save_to_excel(combined, 'bench_netler.xlsx')
+        return len(frames), len(combined)
+
+    def stage_save_to_files():
+        sinks = eskiler.open_sinks()
+        try:
+            for path, (puan_turu, rows) in program_data.items():
+                eskiler.save_to_files(rows, path, puan_turu, sinks)
+        finally:
+            for sink in sinks.values():
+                sink.close()
+        return len(program_data), sum(len(rows) for _, rows in program_data.values())
+
+    stages = [
+        ('fetch', stage_fetch),
+        ('netler_parse', stage_netler_parse),
+        ('netler_frame', stage_netler_frame),
+        ('normalize', stage_normalize),
+        ('get_program_data', stage_get_program_data),
+        ('university_details', stage_university_details),
+        ('save_to_csv', stage_save_to_csv),
+        ('save_to_parquet', stage_save_to_parquet),
+        ('save_to_excel', stage_save_to_excel),
+        ('save_to_files', stage_save_to_files),
+    ]
+
+    results = {}
+    print(f"\n{'aşama':<20} {'süre':>9} {'sayfa/s':>9} {'satır/s':>11} {'tracemalloc':>12} {'RSS':>9}")
+    for name, func in stages:
+        result = measure(func, args.repeat)
+        results[name] = result
+        print(f"{name:<20} {result['seconds']:8.3f}s {result['pages_per_s'] or 0:9.1f} "
+              f"{result['rows_per_s'] or 0:11.1f} {result['alloc_peak_mb']:9.1f} MB {result['peak_rss_mb']:6.0f} MB")
+
+    server.shutdown()
+    cache.close()
+    os.chdir(REPO_DIR)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    os.makedirs(out_dir, exist_ok=True)
+    out_path = os.path.join(out_dir, f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'inputs': {'netler_tablo': [len(netler_pages), netler_source],
+                       '1000_1': [len(university_pages), university_source]},
+            'options': {'repeat': args.repeat, 'concurrency': args.concurrency, 'latency': args.latency},
+            'stages': results,
+        }, f, ensure_ascii=False, indent=1)
+    print(f"\nSonuçlar: {out_path}")
+
+    if baseline and compare(results, baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
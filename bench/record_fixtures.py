@@ -0,0 +1,172 @@
+"""Gerçek YÖK Atlas yanıtlarını çevrimdışı benchmark için fixture klasörüne kaydeder.
+
+Kullanım:
+    python bench/record_fixtures.py [--out bench/fixtures] [--programs 20] [--universities 5]
+
+Kaydedilen sayfalar:
+    netler.php, netler-tablo.php, netler-onlisans-tablo.php,
+    lisans-anasayfa.php, lisans-bolum.php, content/lisans-dynamic/1000_1.php,
+    onlisans-anasayfa.php, onlisans-program.php, content/onlisans-dynamic/3000_1.php
+
+Her sayfa `<out>/<sayfa adı>/<anahtar>.html` olarak yazılır; istek yolu -> dosya
+eşlemesi `<out>/index.json` içinde tutulur. bench/standin_server.py bu klasörü
+aynen geri oynatır. İstekler ortak hız sınırlayıcıdan geçer, önbellek kullanılmaz.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yokatlas_common import BASE_URL  # noqa: E402
+from yokatlas_common.catalog import parse_netler_catalog  # noqa: E402
+from yokatlas_common.client import create_session  # noqa: E402
+from yokatlas_common.ratelimit import polite_get  # noqa: E402
+
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36'
+}
+
+# 3000_1.php için yıl önekleri ('' = güncel yıl)
+DEFAULT_YEAR_PREFIXES = ('', '2024/')
+
+
+def fixture_name(request_path):
+    """'/2024/content/onlisans-dynamic/3000_1.php?y=123' -> ('3000_1', '2024_123')"""
+    parts = urlsplit(request_path)
+    page = os.path.splitext(os.path.basename(parts.path))[0]
+    prefix = parts.path.strip('/').split('/')[0] if re.match(r'^/\d{4}/', parts.path) else ''
+    key = re.sub(r'[^\w.-]+', '_', '_'.join(value for _, value in re.findall(r'(\w+)=([^&]*)', parts.query)))
+    return page, '_'.join(filter(None, [prefix, key])) or 'index'
+
+
+class Recorder:
+    def __init__(self, out_dir, base_url=BASE_URL):
+        self.out_dir = out_dir
+        self.base_url = base_url
+        self.session = create_session()
+        self.session.headers.update(HEADERS)
+        self.index_path = os.path.join(out_dir, 'index.json')
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def get(self, request_path):
+        """Sayfayı indirip kaydeder ve içeriğini döndürür; hata olursa None"""
+        try:
+            response = polite_get(self.session.get, self.base_url + request_path, timeout=15, verify=False)
+        except Exception as e:
+            print(f"  ✗ {request_path}: {e}")
+            return None
+        if response.status_code != 200:
+            print(f"  ✗ {request_path}: HTTP {response.status_code}")
+            return None
+
+        page, key = fixture_name(request_path)
+        path = os.path.join(page, f'{key}.html')
+        os.makedirs(os.path.join(self.out_dir, page), exist_ok=True)
+        with open(os.path.join(self.out_dir, path), 'wb') as f:
+            f.write(response.content)
+
+        self.index[request_path] = {
+            'file': path,
+            'content_type': response.headers.get('Content-Type', 'text/html; charset=utf-8'),
+        }
+        print(f"  ✓ {request_path} ({len(response.content) / 1024:.0f} KB)")
+        return response.content
+
+    def save_index(self):
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+def select_values(content, **attrs):
+    soup = BeautifulSoup(content, 'html.parser')
+    select = soup.find('select', attrs) if attrs else soup
+    if select is None:
+        return []
+    return [option.get('value') for option in select.find_all('option')
+            if option.get('value') and option.get('value').isdigit()]
+
+
+def record_netler(recorder, n_programs):
+    print("netler.php / netler-tablo")
+    content = recorder.get('/netler.php')
+    if content is None:
+        return
+    catalog = parse_netler_catalog(content)
+    for program in catalog['lisans'][:n_programs]:
+        recorder.get(f"/netler-tablo.php?b={program['kod']}")
+    for program in catalog['onlisans'][:n_programs]:
+        recorder.get(f"/netler-onlisans-tablo.php?b={program['kod']}")
+
+
+def record_lisans_bolum(recorder, n_programs, n_universities):
+    print("lisans-anasayfa / lisans-bolum / 1000_1")
+    content = recorder.get('/lisans-anasayfa.php')
+    if content is None:
+        return
+    for program_code in select_values(content, id='bolum2')[:n_programs]:
+        page = recorder.get(f"/lisans-bolum.php?b={program_code}")
+        if page is None:
+            continue
+        soup = BeautifulSoup(page, 'html.parser')
+        codes = []
+        for panel in soup.find_all('div', class_='panel-heading'):
+            link = panel.find('a')
+            if link and 'y=' in link.get('href', ''):
+                codes.append(link['href'].split('y=')[1])
+        for university_code in codes[:n_universities]:
+            recorder.get(f"/content/lisans-dynamic/1000_1.php?y={university_code}")
+
+
+def record_onlisans_program(recorder, n_programs, n_universities, year_prefixes):
+    print("onlisans-anasayfa / onlisans-program / 3000_1")
+    content = recorder.get('/onlisans-anasayfa.php')
+    if content is None:
+        return
+    for program_id in sorted(set(select_values(content)))[:n_programs]:
+        page = recorder.get(f"/onlisans-program.php?b={program_id}")
+        if page is None:
+            continue
+        soup = BeautifulSoup(page, 'html.parser')
+        y_codes = sorted({a['href'].split('y=')[1] for a in soup.find_all('a', href=True)
+                          if 'onlisans.php?y=' in a['href']})
+        for y in y_codes[:n_universities]:
+            for prefix in year_prefixes:
+                recorder.get(f"/{prefix}content/onlisans-dynamic/3000_1.php?y={y}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default=DEFAULT_OUT)
+    parser.add_argument('--programs', type=int, default=20, help="her sayfa türü için program sayısı")
+    parser.add_argument('--universities', type=int, default=5, help="program başına üniversite/y kodu sayısı")
+    parser.add_argument('--years', nargs='*', default=list(DEFAULT_YEAR_PREFIXES),
+                        help="3000_1.php yıl önekleri ('' güncel yıl, '2024/' vb.)")
+    args = parser.parse_args()
+
+    import urllib3
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    recorder = Recorder(args.out)
+    try:
+        record_netler(recorder, args.programs)
+        record_lisans_bolum(recorder, args.programs, args.universities)
+        record_onlisans_program(recorder, args.programs, args.universities, args.years)
+    finally:
+        recorder.save_index()
+    print(f"\n{len(recorder.index)} sayfa: {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""Kaydedilmiş fixture'ları YÖK Atlas yerine sunan yerel HTTP sunucusu.
+
+Kullanım:
+    python bench/standin_server.py [--fixtures bench/fixtures] [--port 8765]
+                                   [--latency 0.05] [--jitter 0.02]
+                                   [--error-rate 0.01] [--rate 20] [--synthetic]
+
+Kazıyıcılar YOKATLAS_BASE_URL ile bu sunucuya yönlendirilir:
+    YOKATLAS_BASE_URL=http://127.0.0.1:8765 python yokatlas-lisans-netler.py
+
+- latency/jitter: her yanıttan önce beklenen süre (saniye, normal dağılım)
+- error-rate: rastgele 503 dönen isteklerin oranı
+- rate: saniyedeki istek sınırı; aşılırsa Retry-After ile 429 döner (0: sınırsız)
+- synthetic: kaydı olmayan netler-tablo isteklerine sentetik sayfa üretir
+ETag / If-None-Match desteklenir; önbellek revalidasyonu da ölçülebilir.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import netler_tablo_page  # noqa: E402
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+SYNTHETIC_RE = re.compile(r'^/netler-(?:onlisans-)?tablo\.php\?b=(\d+)$')
+
+
+class Throttle:
+    """Tüm istemciler için ortak token bucket; boş jeton yoksa bekleme süresini döndürür"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        if not self.rate:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fixtures, latency=0.0, jitter=0.0, error_rate=0.0, rate=0, synthetic=False):
+        super().__init__(address, StandinHandler)
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle = Throttle(rate)
+        self.synthetic = synthetic
+        self.stats = {'200': 0, '304': 0, '404': 0, '429': 0, '503': 0}
+        self.stats_lock = threading.Lock()
+
+        self.index = {}
+        index_path = os.path.join(fixtures, 'index.json')
+        if os.path.exists(index_path):
+            with open(index_path, encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def count(self, status):
+        with self.stats_lock:
+            self.stats[str(status)] = self.stats.get(str(status), 0) + 1
+
+    def lookup(self, request_path):
+        """(içerik, content-type) döndürür; kayıt yoksa None"""
+        entry = self.index.get(request_path)
+        if entry is not None:
+            with open(os.path.join(self.fixtures, entry['file']), 'rb') as f:
+                return f.read(), entry['content_type']
+        match = SYNTHETIC_RE.match(request_path) if self.synthetic else None
+        if match:
+            return netler_tablo_page(int(match.group(1))), 'text/html; charset=utf-8'
+        return None
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def send_empty(self, status, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        self.server.count(status)
+
+    def do_GET(self):
+        server = self.server
+
+        wait = server.throttle.take()
+        if wait:
+            self.send_empty(429, [('Retry-After', f'{max(1, round(wait))}')])
+            return
+
+        delay = server.latency + random.gauss(0, server.jitter) if server.jitter else server.latency
+        if delay > 0:
+            time.sleep(delay)
+
+        if server.error_rate and random.random() < server.error_rate:
+            self.send_empty(503)
+            return
+
+        found = server.lookup(self.path)
+        if found is None:
+            self.send_empty(404)
+            return
+        content, content_type = found
+
+        etag = '"' + hashlib.sha1(content).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_empty(304, [('ETag', etag)])
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(content)
+        server.count(200)
+
+
+def _stop(*_):
+    raise KeyboardInterrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help="saniye")
+    parser.add_argument('--jitter', type=float, default=0.0, help="saniye (standart sapma)")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate', type=float, default=0, help="saniyedeki istek sınırı (0: sınırsız)")
+    parser.add_argument('--synthetic', action='store_true')
+    args = parser.parse_args()
+
+    server = StandinServer((args.host, args.port), args.fixtures, args.latency, args.jitter,
+                           args.error_rate, args.rate, args.synthetic)
+    print(f"{len(server.index)} kayıtlı sayfa, http://{args.host}:{args.port} "
+          f"(gecikme {args.latency}s, hata %{args.error_rate * 100:.0f}, sınır {args.rate or '∞'} istek/s)")
+    # Arka planda çalışırken de (kill) istatistikler yazılsın
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\nYanıtlar: {server.stats}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
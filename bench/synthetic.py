@@ -0,0 +1,82 @@
+"""Ağ erişimi olmadan benchmark yapabilmek için YÖK Atlas benzeri sentetik sayfalar."""
+
+import random
+
+NETLER_HEADERS = [
+    '', 'Üniversite', 'Yılı', 'Türü', 'Katsayı', 'Yerleşen Son Kişinin OBP',
+    'Yerleşen Son Kişinin Puanı', '', 'Yerleşen', 'TYT Türkçe(40)', 'TYT Sosyal(20)',
+    'TYT Mat(40)', 'TYT Fen(20)', 'AYT Mat(40)', 'AYT Fizik(14)', 'AYT Kimya(13)', 'AYT Biyoloji(13)'
+]
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html lang="tr"><head><meta charset="utf-8"><title>{title}</title>
+<link rel="stylesheet" href="/css/bootstrap.min.css"><script src="/js/jquery.min.js"></script>
+</head><body><nav class="navbar"><ul>{nav}</ul></nav><div class="container">"""
+
+PAGE_TAIL = """</div><footer><p>YÖK Atlas</p></footer></body></html>"""
+
+
+def _nav(rng):
+    return ''.join(f'<li><a href="/sayfa{i}.php">Bağlantı {i}</a></li>' for i in range(rng.randint(20, 40)))
+
+
+def _net(rng, max_value):
+    value = rng.uniform(-2, max_value)
+    return f"{value:.2f}".replace('.', ',')
+
+
+def netler_tablo_page(program_code, n_rows=150, puan_turu='SAY', seed=None):
+    """netler-tablo.php?b=<program_code> benzeri sayfa üretir"""
+    rng = random.Random(seed if seed is not None else program_code)
+    head = ''.join(f'<th>{h}</th>' for h in NETLER_HEADERS)
+    filters = ''.join('<td><input type="text" class="form-control"></td>' for _ in NETLER_HEADERS)
+    rows = []
+    for i in range(n_rows):
+        y_code = 100000000 + rng.randint(0, 99999999)
+        score = rng.uniform(180, 560)
+        obp = rng.uniform(50, 100)
+        cells = [
+            '<td></td>',
+            f'<td><a href="lisans.php?y={y_code}" target="_blank">ÖRNEK ÜNİVERSİTESİ {i} '
+            f'<small>(Mühendislik Fakültesi)</small></a></td>',
+            f'<td>{rng.choice([2025, 2024, 2023])}</td>',
+            f'<td>{rng.choice(["Devlet", "Vakıf"])}</td>',
+            '<td>0,12</td>',
+            f'<td>{obp:.4f}'.replace('.', ',') + '</td>',
+            f'<td>{score:.5f}'.replace('.', ',') + '</td>',
+            f'<td>{score - 6:.5f}'.replace('.', ',') + '</td>',
+            f'<td>{rng.randint(0, 120)}</td>',
+            f'<td>{_net(rng, 40)}</td>', f'<td>{_net(rng, 20)}</td>',
+            f'<td>{_net(rng, 40)}</td>', f'<td>{_net(rng, 20)}</td>',
+            f'<td>{_net(rng, 40)}</td>', f'<td>{_net(rng, 14)}</td>',
+            f'<td>{_net(rng, 13)}</td>',
+            f'<td>{rng.choice([_net(rng, 13), "---", "Dolmadı"])}</td>',
+        ]
+        rows.append('<tr>' + ''.join(cells) + '</tr>')
+
+    table = (f'<table id="mydata" class="table table-bordered"><thead><tr>{head}</tr><tr>{filters}</tr></thead>'
+             f'<tbody>{"".join(rows)}</tbody></table>')
+    title = f"Program {program_code} Netleri ({puan_turu}) - YÖK Atlas"
+    return (PAGE_HEAD.format(title=title, nav=_nav(rng)) + table + PAGE_TAIL).encode('utf-8')
+
+
+UNIVERSITY_FIELDS = [
+    'ÖSYM Program Kodu', 'Üniversite Türü', 'Üniversite', 'Fakülte / Yüksekokul', 'Puan Türü',
+    'Burs Türü', 'Genel Kontenjan', 'Okul Birincisi Kontenjanı', 'Toplam Kontenjan',
+    'Genel Kontenjana Yerleşen', 'Toplam Yerleşen', 'Boş Kalan Kontenjan',
+    'İlk Yerleşme Oranı', 'Kayıt Yaptırmayan', 'Ek Yerleşen',
+    '0,12 Katsayı ile Yerleşen Son Kişinin Puanı', '0,12 Katsayı ile Yerleşen Son Kişinin Başarı Sırası',
+]
+
+
+def university_details_page(university_code, seed=None):
+    """content/lisans-dynamic/1000_1.php?y=<university_code> benzeri sayfa üretir"""
+    rng = random.Random(seed if seed is not None else university_code)
+    title = (f'<table class="table table-bordered"><thead><tr><th class="thb text-center" colspan="2">'
+             f'<big>ÖRNEK ÜNİVERSİTESİ {university_code % 200} (Mühendislik Fakültesi)</big></th></tr></thead>')
+    rows = []
+    for field in UNIVERSITY_FIELDS:
+        value = rng.choice([str(rng.randint(0, 500)), f'{rng.uniform(150, 560):.5f}'.replace('.', ','), 'Devlet', '---'])
+        rows.append(f'<tr><td class="thb">{field}*</td><td class="text-center">{value}</td></tr>')
+    table = title + '<tbody>' + ''.join(rows) + '</tbody></table>'
+    return (PAGE_HEAD.format(title=f"{university_code} - YÖK Atlas", nav=_nav(rng)) + table + PAGE_TAIL).encode('utf-8')
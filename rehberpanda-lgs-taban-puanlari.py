@@ -3,93 +3,318 @@ import nest_asyncio
 nest_asyncio.apply()
 
 from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
-import csv, os
+
+from yokatlas_common.metrics import METRICS, export_metrics
+from yokatlas_common.sinks import BufferedRowSink
 
 BASE_URL = "https://rehberpanda.com"
 START_URL = BASE_URL + "/araclar/taban-puanlari/lgs/sehir/"
 CSV_FILE = "lgs_taban_puanlari_live.csv"
 
-# CSV başlık
-if not os.path.exists(CSV_FILE):
-    with open(CSV_FILE, "w", newline="", encoding="utf-8-sig") as f:
-        csv.writer(f).writerow([
-            "Il","Ilce","LiseTuru","OkulAdi",
-            "Dil","TabanPuan","Yuzdelik","Kontenjan","Yil"
-        ])
+# Aynı anda açık tutulacak tarayıcı sayfası (context) sayısı
+CONCURRENCY = 4
 
-async def run():
-    print("🚀 Scraper başladı (YEAR-AWARE / STABLE)")
+# Kart verisi XHR/fetch JSON olarak geliyorsa satırlar doğrudan JSON'dan kurulur
+INTERCEPT_JSON = True
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--single-process",
-                "--no-zygote"
+CSV_HEADERS = [
+    "Il","Ilce","LiseTuru","OkulAdi",
+    "Dil","TabanPuan","Yuzdelik","Kontenjan","Yil"
+]
+
+# Sayfa yükünü hafifletmek için engellenen kaynaklar
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+BLOCKED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "facebook.net", "hotjar.com", "clarity.ms", "yandex.ru"
+)
+
+async def block_heavy_resources(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(h in request.url for h in BLOCKED_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+def timing_span(timing, start, end):
+    # Playwright zamanları ms cinsinden ve startTime'a göre; -1 ölçülmedi demek
+    if timing[start] < 0 or timing[end] < 0:
+        return None
+    return (timing[end] - timing[start]) / 1000
+
+async def record_timing(request):
+    # Belge ve XHR/fetch isteklerinin DNS/bağlantı/TTFB/indirme süreleri METRICS'e yazılır
+    if request.resource_type not in ("document", "xhr", "fetch"):
+        return
+    try:
+        response = await request.response()
+        sizes = await request.sizes()
+    except Exception:
+        return
+    timing = request.timing
+    METRICS.record_request(
+        request.url, response.status if response else None, max(timing["responseEnd"], 0) / 1000,
+        size=sizes["responseBodySize"],
+        dns=timing_span(timing, "domainLookupStart", "domainLookupEnd"),
+        connect=timing_span(timing, "connectStart", "connectEnd"),
+        ttfb=timing_span(timing, "requestStart", "responseStart"),
+        download=timing_span(timing, "responseStart", "responseEnd"),
+        page=f"lgs-{request.resource_type}",
+    )
+
+# .school-card arkasındaki JSON alan adları için adaylar
+JSON_FIELDS = {
+    "OkulAdi": ("okulAdi", "okul_adi", "schoolName", "school_name", "name", "title"),
+    "Ilce": ("ilce", "district", "districtName", "district_name"),
+    "LiseTuru": ("liseTuru", "lise_turu", "schoolType", "school_type", "type"),
+    "Dil": ("dil", "language", "yabanciDil", "foreignLanguage"),
+    "TabanPuan": ("tabanPuan", "taban_puan", "minScore", "min_score", "score", "puan"),
+    "Yuzdelik": ("yuzdelik", "yuzdelikDilim", "percentile", "percentage"),
+    "Kontenjan": ("kontenjan", "quota", "capacity"),
+}
+
+# Sayfadaki kartlarda sayıların ondalık basamağı ("452,50", "1,25", "120");
+# JSON'dan gelen sayılar DOM yolundaki satırlarla aynı görünsün diye bu biçime çevrilir
+JSON_DECIMALS = {"TabanPuan": 2, "Yuzdelik": 2, "Kontenjan": 0}
+
+def format_number(value, decimals):
+    """452.5 / "452.5" -> "452,50"; sayı olmayan ya da zaten virgüllü değer olduğu gibi kalır"""
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, str):
+        if "," in value:
+            return value
+        try:
+            value = float(value.replace("%", "").strip())
+        except ValueError:
+            return value
+    return f"{value:.{decimals}f}".replace(".", ",")
+
+def pick(record, field):
+    for key in JSON_FIELDS[field]:
+        value = record.get(key)
+        if value is not None:
+            if isinstance(value, dict):
+                value = value.get("name", "")
+            if field in JSON_DECIMALS:
+                value = format_number(value, JSON_DECIMALS[field])
+            return str(value).strip()
+    return ""
+
+def find_school_records(payload):
+    """JSON içinde okul adı ve taban puanı taşıyan ilk sözlük listesini bulur"""
+    if isinstance(payload, list):
+        if payload and all(isinstance(item, dict) for item in payload):
+            sample = payload[0]
+            if any(k in sample for k in JSON_FIELDS["OkulAdi"]) and any(k in sample for k in JSON_FIELDS["TabanPuan"]):
+                return payload
+        items = payload
+    elif isinstance(payload, dict):
+        items = payload.values()
+    else:
+        return None
+
+    for item in items:
+        found = find_school_records(item)
+        if found:
+            return found
+    return None
+
+class JsonCapture:
+    """Sayfanın XHR/fetch ile aldığı JSON yanıtlarını toplar
+
+    Yalnızca son reset()'ten sonra başlayan isteklerin yanıtları sayılır; önceki
+    yılın geç gelen yanıtı sonraki yılın sonuçlarına karışmaz.
+    """
+
+    def __init__(self, page):
+        self.requests = set()
+        self.pending = []
+        self.payloads = []
+        page.on("request", self.on_request)
+        page.on("response", self.on_response)
+
+    def on_request(self, request):
+        if request.resource_type in ("xhr", "fetch"):
+            self.requests.add(request)
+
+    def on_response(self, response):
+        if response.request in self.requests and "json" in (response.headers.get("content-type") or ""):
+            self.pending.append(asyncio.ensure_future(self.read(response)))
+
+    async def read(self, response):
+        try:
+            self.payloads.append(await response.json())
+        except Exception:
+            pass
+
+    def reset(self):
+        for task in self.pending:
+            task.cancel()
+        self.pending.clear()
+        self.payloads.clear()
+        self.requests.clear()
+
+    async def school_records(self):
+        await asyncio.gather(*self.pending, return_exceptions=True)
+        self.pending.clear()
+        for payload in reversed(self.payloads):
+            records = find_school_records(payload)
+            if records:
+                return records
+        return None
+
+# JSON kaydında boş olmaması gereken alanlar
+REQUIRED_JSON_FIELDS = ("Ilce", "LiseTuru", "OkulAdi", "TabanPuan")
+
+def json_matches_dom(records, card_names):
+    """JSON kayıtları sayfadaki kartlarla örtüşüyorsa True (sayı, zorunlu alanlar, okul adları)"""
+    if len(records) != len(card_names):
+        return False
+    if any(not pick(r, field) for r in records for field in REQUIRED_JSON_FIELDS):
+        return False
+    return sorted(pick(r, "OkulAdi") for r in records) == sorted(card_names)
+
+# JSON yoksa kartlar tarayıcı içinde okunur (tüm DOM'u serileştirip soup'a vermeden)
+CARDS_JS = """cards => cards.map(card => [
+    ...Array.from(card.querySelectorAll('span')).slice(0, 3).map(e => e.textContent.trim()),
+    (card.querySelector('h3') || {textContent: ''}).textContent.trim(),
+    ...Array.from(card.querySelectorAll('.text-xl.font-bold')).slice(0, 3).map(e => e.textContent.trim())
+])"""
+
+CARD_NAMES_JS = "cards => cards.map(card => (card.querySelector('h3') || {textContent: ''}).textContent.trim())"
+
+async def year_rows(page, capture, city, year):
+    records = await capture.school_records() if capture else None
+    # Alan adları tahmin edildiği için JSON yalnızca kartlarla örtüşürse kullanılır
+    if records and json_matches_dom(records, await page.eval_on_selector_all(".school-card", CARD_NAMES_JS)):
+        with METRICS.timer("yokatlas_parse_seconds", parser="lgs-json"):
+            return [
+                [city, pick(r, "Ilce"), pick(r, "LiseTuru"), pick(r, "OkulAdi"), pick(r, "Dil"),
+                 pick(r, "TabanPuan"), pick(r, "Yuzdelik").replace("%","").strip(), pick(r, "Kontenjan"), year]
+                for r in records
             ]
-        )
+
+    rows = []
+    with METRICS.timer("yokatlas_parse_seconds", parser="lgs-dom"):
+        for ilce, lise_turu, dil, okul_adi, taban, yuzdelik, kontenjan in await page.eval_on_selector_all(".school-card", CARDS_JS):
+            rows.append([city, ilce, lise_turu, okul_adi, dil, taban, yuzdelik.replace("%","").strip(), kontenjan, year])
+    return rows
+
+async def scrape_city(page, capture, city, city_url, rows):
+    if capture:
+        capture.reset()
+    await page.goto(city_url, wait_until="domcontentloaded")
+    await page.wait_for_selector(".school-card")
+
+    # 🔑 BU SAYFADAKİ YILLARI OKU
+    year_buttons = await page.locator("div.flex.flex-wrap.gap-2.mb-6 button").all_text_contents()
+    years = [y.strip() for y in year_buttons]
+
+    print(f"  📅 {city}: bulunan yıllar {years}")
+
+    for yi, year in enumerate(years):
+        if yi > 0:
+            if capture:
+                capture.reset()
+            await page.click(f"button:has-text('{year}')")
+            await page.wait_for_selector(".school-card")
+
+        city_rows = await year_rows(page, capture, city, year)
+
+        print(f"    🏫 {city} {year}: {len(city_rows)} okul")
+
+        for row in city_rows:
+            await rows.put(row)
+
+async def city_worker(browser, cities, rows, total, intercept):
+    # Her işçinin kendi context'i ve sayfası var; iller ortak kuyruktan çekilir
+    context = await browser.new_context(viewport={"width":1920,"height":1080})
+    await context.route("**/*", block_heavy_resources)
+    context.on("requestfinished", record_timing)
+    page = await context.new_page()
+    capture = JsonCapture(page) if intercept else None
+    try:
+        while True:
+            try:
+                ci, city, city_url = cities.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            print(f"\n🏙️ ({ci}/{total}) {city}")
+            try:
+                await scrape_city(page, capture, city, city_url, rows)
+            except Exception as e:
+                print(f"  ⚠️ {city} atlandı: {e}")
+    finally:
+        await context.close()
+
+async def csv_writer(rows):
+    # Tüm işçilerin satırları tek bir tamponlu yazıcıdan geçer
+    with BufferedRowSink(CSV_FILE, headers=CSV_HEADERS, encoding="utf-8-sig") as sink:
+        while True:
+            row = await rows.get()
+            if row is None:
+                return
+            sink.write(row)
+
+async def run(concurrency=CONCURRENCY, intercept=INTERCEPT_JSON):
+    print(f"🚀 Scraper başladı (YEAR-AWARE / STABLE, {concurrency} sayfa)")
+
+    args = [
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-gpu",
+        "--no-zygote"
+    ]
+    if concurrency == 1:
+        # Tek sayfada eski, tek süreçli davranış
+        args.append("--single-process")
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=args)
 
         page = await browser.new_page(viewport={"width":1920,"height":1080})
+        await page.route("**/*", block_heavy_resources)
 
         # ANA SAYFA – İLLER
         print("📍 İller yükleniyor…")
         await page.goto(START_URL, wait_until="domcontentloaded")
         await page.wait_for_selector("a.city-card")
 
-        soup = BeautifulSoup(await page.content(), "html.parser")
         cities = [
-            (a.select_one("h3").text.strip(), BASE_URL + a["href"])
-            for a in soup.select("a.city-card")
+            (city, BASE_URL + href)
+            for city, href in await page.eval_on_selector_all(
+                "a.city-card",
+                "links => links.map(a => [a.querySelector('h3').textContent.trim(), a.getAttribute('href')])"
+            )
         ]
+        await page.close()
 
         print(f"✅ {len(cities)} il bulundu")
 
-        # HER İL
+        # HER İL – K işçi ortak kuyruktan il çeker
+        city_queue = asyncio.Queue()
         for ci, (city, city_url) in enumerate(cities, 1):
-            print(f"\n🏙️ ({ci}/{len(cities)}) {city}")
-            await page.goto(city_url, wait_until="domcontentloaded")
-            await page.wait_for_selector(".school-card")
-
-            # 🔑 BU SAYFADAKİ YILLARI OKU
-            year_buttons = await page.locator("div.flex.flex-wrap.gap-2.mb-6 button").all_text_contents()
-            years = [y.strip() for y in year_buttons]
-
-            print(f"  📅 Bulunan yıllar: {years}")
-
-            for yi, year in enumerate(years):
-                if yi > 0:
-                    await page.click(f"button:has-text('{year}')")
-                    await page.wait_for_selector(".school-card")
-
-                soup = BeautifulSoup(await page.content(), "html.parser")
-                cards = soup.select(".school-card")
-
-                print(f"    🏫 {year}: {len(cards)} okul")
+            city_queue.put_nowait((ci, city, city_url))
 
-                for card in cards:
-                    spans = card.select("span")
-                    values = card.select(".text-xl.font-bold")
+        rows = asyncio.Queue()
+        writer_task = asyncio.create_task(csv_writer(rows))
 
-                    with open(CSV_FILE, "a", newline="", encoding="utf-8-sig") as f:
-                        csv.writer(f).writerow([
-                            city,
-                            spans[0].text.strip(),
-                            spans[1].text.strip(),
-                            card.select_one("h3").text.strip(),
-                            spans[2].text.strip(),
-                            values[0].text.strip(),
-                            values[1].text.replace("%","").strip(),
-                            values[2].text.strip(),
-                            year
-                        ])
+        try:
+            await asyncio.gather(*[
+                city_worker(browser, city_queue, rows, len(cities), intercept)
+                for _ in range(min(concurrency, len(cities)))
+            ])
+        finally:
+            # İşçiler hata verse de yazıcı kapanır, o ana kadarki satırlar CSV'ye yazılır
+            await rows.put(None)
+            await writer_task
 
         await browser.close()
 
     print("\n🎉 Tamamlandı – Karabük dahil hiçbir il takılmadı")
     print(f"📁 CSV hazır: {CSV_FILE}")
+    export_metrics()
 
 asyncio.get_event_loop().run_until_complete(run())
@@ -1,10 +1,16 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-import time
 import os
 from datetime import datetime
 
+from yokatlas_common import BASE_URL
+from yokatlas_common.cache import cached_get
+from yokatlas_common.client import get_session
+from yokatlas_common.metrics import export_metrics
+from yokatlas_common.ycodes import YCodeIndex
+
+session = get_session()
+
 def create_folders():
     folder_name = "bolum-universite"
     if not os.path.exists(folder_name):
@@ -16,13 +22,13 @@ def create_folders():
     return excel_path, csv_path
 
 def get_all_programs():
-    url = "https://yokatlas.yok.gov.tr/lisans-anasayfa.php"
+    url = f"{BASE_URL}/lisans-anasayfa.php"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36'
     }
 
     try:
-        response = requests.get(url, headers=headers)
+        response = cached_get(session.get, url, headers=headers)
         response.raise_for_status()
         soup = BeautifulSoup(response.content, 'html.parser')
 
@@ -43,13 +49,13 @@ def get_all_programs():
         return {}
 
 def get_program_links(program_code):
-    url = f"https://yokatlas.yok.gov.tr/lisans-bolum.php?b={program_code}"
+    url = f"{BASE_URL}/lisans-bolum.php?b={program_code}"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36'
     }
 
     try:
-        response = requests.get(url, headers=headers)
+        response = cached_get(session.get, url, headers=headers)
         response.raise_for_status()
         soup = BeautifulSoup(response.content, 'html.parser')
 
@@ -71,13 +77,13 @@ def get_program_links(program_code):
         return []
 
 def get_university_details(university_code):
-    url = f"https://yokatlas.yok.gov.tr/content/lisans-dynamic/1000_1.php?y={university_code}"
+    url = f"{BASE_URL}/content/lisans-dynamic/1000_1.php?y={university_code}"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36'
     }
 
     try:
-        response = requests.get(url, headers=headers)
+        response = cached_get(session.get, url, headers=headers)
         response.raise_for_status()
         soup = BeautifulSoup(response.content, 'html.parser')
 
@@ -130,6 +136,9 @@ def main():
     total_programs = len(programs)
     print(f"\nToplam {total_programs} program bulundu.")
 
+    # Birden çok bölümde geçen üniversite sayfası bir kez çekilir (satırlar aynı olurdu)
+    index = YCodeIndex()
+
     is_first = True
     for prog_idx, (program_code, program_name) in enumerate(programs.items(), 1):
         print(f"\rProgram {prog_idx}/{total_programs}: {program_name}", end='', flush=True)
@@ -138,6 +147,8 @@ def main():
         print(f"\rProgram {prog_idx}/{total_programs}: {program_name} - {len(university_codes)} üniversite bulundu", end='', flush=True)
 
         for univ_idx, univ_code in enumerate(university_codes, 1):
+            if not index.claim(univ_code):
+                continue
             print(f"\rProgram {prog_idx}/{total_programs}: {program_name} - Üniversite {univ_idx}/{len(university_codes)} işleniyor...", end='', flush=True)
 
             details = get_university_details(univ_code)
@@ -146,12 +157,10 @@ def main():
                 save_data(details, excel_path, csv_path, is_first)
                 is_first = False
 
-            time.sleep(1)
-
         print()  # Yeni satıra geç
-        time.sleep(2)
 
     print("\nTüm işlemler tamamlandı!")
+    export_metrics()
 
 if __name__ == "__main__":
     main()
@@ -171,14 +180,33 @@ if __name__ == "__main__":
 
 
 
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import os
+import queue
+import threading
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 
+from yokatlas_common import BASE_URL
+from yokatlas_common.cache import cached_get
+from yokatlas_common.client import create_session
+from yokatlas_common.columnar import write_parquet
+from yokatlas_common.metrics import METRICS, export_metrics
+from yokatlas_common.sinks import LongFormatSink, write_excel
+from yokatlas_common.ycodes import YCodeIndex
+
+# Bölüm sayfaları LINK_WORKERS, 1000_1 sayfaları DETAIL_WORKERS işçiyle çekilir;
+# tüm işçiler bağlantı havuzu sabit tek bir oturumu paylaşır
+LINK_WORKERS = 4
+DETAIL_WORKERS = 10
+WRITE_QUEUE = 100  # yazıcıyı bekleyen en fazla program
+
+# Program -> y kodu referansları ve çekilmiş detaylar (çalıştırmalar arası)
+Y_CODE_INDEX = os.path.join('.cache', 'lisans_ycodes.sqlite')
+
+session = create_session(pool_size=LINK_WORKERS + DETAIL_WORKERS)
+
 def create_folders():
     folder_name = "bolum-universite"
     if not os.path.exists(folder_name):
@@ -190,13 +218,13 @@ def create_folders():
     return excel_path, csv_path
 
 def get_all_programs():
-    url = "https://yokatlas.yok.gov.tr/lisans-anasayfa.php"
+    url = f"{BASE_URL}/lisans-anasayfa.php"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36'
     }
 
     try:
-        response = requests.get(url, headers=headers)
+        response = cached_get(session.get, url, headers=headers)
         response.raise_for_status()
         soup = BeautifulSoup(response.content, 'html.parser')
 
@@ -217,13 +245,13 @@ def get_all_programs():
         return {}
 
 def get_program_links(program_code):
-    url = f"https://yokatlas.yok.gov.tr/lisans-bolum.php?b={program_code}"
+    url = f"{BASE_URL}/lisans-bolum.php?b={program_code}"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36'
     }
 
     try:
-        response = requests.get(url, headers=headers)
+        response = cached_get(session.get, url, headers=headers)
         response.raise_for_status()
         soup = BeautifulSoup(response.content, 'html.parser')
 
@@ -246,36 +274,37 @@ def get_program_links(program_code):
 
 def get_university_details(args):
     university_code, program_name = args
-    url = f"https://yokatlas.yok.gov.tr/content/lisans-dynamic/1000_1.php?y={university_code}"
+    url = f"{BASE_URL}/content/lisans-dynamic/1000_1.php?y={university_code}"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36'
     }
 
     try:
-        response = requests.get(url, headers=headers)
+        response = cached_get(session.get, url, headers=headers)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        with METRICS.timer('yokatlas_parse_seconds', parser='1000_1'):
+            soup = BeautifulSoup(response.content, 'html.parser')
 
-        details = {}
-        details['Program'] = program_name
+            details = {}
+            details['Program'] = program_name
 
-        program_title = soup.find('th', class_='thb text-center')
-        if program_title and program_title.find('big'):
-            full_title = program_title.find('big').text.strip()
-            university_name = full_title.split('(')[0].strip()
-            details['Üniversite'] = university_name
-        else:
-            details['Üniversite'] = ""
-
-        tables = soup.find_all('table', class_='table table-bordered')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cols = row.find_all(['th', 'td'])
-                if len(cols) == 2:
-                    key = cols[0].text.strip().replace('\n', ' ').replace('*', '').replace('  ', ' ')
-                    value = cols[1].text.strip().replace('\n', ' ')
-                    details[key] = value
+            program_title = soup.find('th', class_='thb text-center')
+            if program_title and program_title.find('big'):
+                full_title = program_title.find('big').text.strip()
+                university_name = full_title.split('(')[0].strip()
+                details['Üniversite'] = university_name
+            else:
+                details['Üniversite'] = ""
+
+            tables = soup.find_all('table', class_='table table-bordered')
+            for table in tables:
+                rows = table.find_all('tr')
+                for row in rows:
+                    cols = row.find_all(['th', 'td'])
+                    if len(cols) == 2:
+                        key = cols[0].text.strip().replace('\n', ' ').replace('*', '').replace('  ', ' ')
+                        value = cols[1].text.strip().replace('\n', ' ')
+                        details[key] = value
 
         return details
 
@@ -283,22 +312,153 @@ def get_university_details(args):
         print(f"Hata (Üniversite {university_code}): {e}")
         return None
 
-def process_program(program_code, program_name, all_data):
-    university_codes = get_program_links(program_code)
-
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = [executor.submit(get_university_details, (code, program_name)) for code in university_codes]
+def crawl(programs, index):
+    """Bölüm sayfalarından çıkan 1000_1 isteklerini tek bir ortak kuyruktan sabit sayıda işçiyle çeker
 
-        for future in as_completed(futures):
-            result = future.result()
-            if result:
-                all_data.append(result)
-
-def save_batch_data(data_list, excel_path, csv_path):
-    if data_list:
-        df = pd.DataFrame(data_list)
-        df.to_excel(excel_path, index=False)
-        df.to_csv(csv_path, index=False)
+    Bulunan her üniversite kodu hemen kuyruğa girer; yavaş bir program diğerlerini
+    bekletmez. Bir y kodu çalıştırma başına en fazla bir kez çekilir (index'te taze
+    detayı varsa hiç çekilmez); birden çok bölümde geçen kodun detayı her bölüme ayrı
+    kayıt olarak verilir. Her program bitince çağıran thread'e (program kodu,
+    [(üniversite kodu, detaylar), ...]) döner.
+    """
+    jobs = queue.Queue(maxsize=DETAIL_WORKERS * 10)
+    finished = queue.Queue()
+    stop = threading.Event()
+    pending = {}
+    records = {}
+    waiting = {}  # çekilmekte olan y kodu -> sonucunu bekleyen programlar
+    lock = threading.Lock()
+
+    def finish(program_code, record=None):
+        with lock:
+            if record is not None:
+                records[program_code].append(record)
+            pending[program_code] -= 1
+            if pending[program_code]:
+                return
+            del pending[program_code]
+            program_records = records.pop(program_code)
+        finished.put((program_code, program_records))
+
+    def deliver(university_code, details):
+        with lock:
+            program_codes = waiting.pop(university_code)
+        for program_code in program_codes:
+            record = (university_code, {**details, 'Program': programs[program_code]}) if details else None
+            finish(program_code, record)
+
+    def detail_worker():
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            if stop.is_set():
+                continue
+            university_code, program_name = job
+            details = None
+            try:
+                details = get_university_details((university_code, program_name))
+                if details:
+                    index.save(university_code, details)
+            except Exception as e:
+                print(f"Hata (Üniversite {university_code}): {e}")
+            finally:
+                deliver(university_code, details)
+
+    def produce(program_code, program_name):
+        with lock:
+            # +1: program, kodları kuyruğa girmeden bitmiş sayılmasın
+            pending[program_code] = 1
+            records[program_code] = []
+        to_fetch = []
+        queued = 0
+        try:
+            university_codes = list(dict.fromkeys(get_program_links(program_code) or []))
+            index.add_references(program_code, university_codes)
+
+            with lock:
+                for university_code in university_codes:
+                    if university_code in waiting:
+                        waiting[university_code].append(program_code)
+                        pending[program_code] += 1
+                        continue
+                    details = index.stored(university_code)
+                    if details is not None:
+                        records[program_code].append((university_code, {**details, 'Program': program_name}))
+                    elif index.claim(university_code):
+                        waiting[university_code] = [program_code]
+                        pending[program_code] += 1
+                        to_fetch.append(university_code)
+                    # Kalanlar bu çalıştırmada denenip alınamayan kodlar
+
+            for university_code in to_fetch:
+                if stop.is_set():
+                    return
+                jobs.put((university_code, program_name))
+                queued += 1
+        except Exception as e:
+            print(f"Hata (Program {program_code}): {e}")
+        finally:
+            # Hata ya da durdurma olsa da program kapanır; kuyruğa giremeyen kodlar boş sonuç alır
+            for university_code in to_fetch[queued:]:
+                deliver(university_code, None)
+            finish(program_code)
+
+    workers = [threading.Thread(target=detail_worker, daemon=True) for _ in range(DETAIL_WORKERS)]
+    for worker in workers:
+        worker.start()
+    link_pool = ThreadPoolExecutor(max_workers=LINK_WORKERS)
+    for program_code, program_name in programs.items():
+        link_pool.submit(produce, program_code, program_name)
+    try:
+        for _ in range(len(programs)):
+            yield finished.get()
+    finally:
+        # Yarıda kesilirse kuyruktaki işler atlanır, işçiler kapanır
+        stop.set()
+        link_pool.shutdown(wait=True, cancel_futures=True)
+        for _ in workers:
+            jobs.put(None)
+        for worker in workers:
+            worker.join()
+
+def write_records(records, sink, errors):
+    """Yazıcı thread: kuyruktan gelen program kayıtlarını uzun biçimli CSV'ye ekler; None gelince kapanır
+
+    Hata olursa errors'a eklenip thread durur; üretici put_records'ta bunu görür.
+    """
+    try:
+        while True:
+            batch = records.get()
+            if batch is None:
+                return
+            for university_code, details in batch:
+                sink.write_record((details['Program'], university_code), details)
+    except Exception as e:
+        errors.append(e)
+    finally:
+        sink.close()
+
+def put_records(records, batch, writer, errors):
+    """Yazıcı kuyruğuna ekler; yazıcı durmuşsa dolu kuyrukta beklemek yerine hatasını yükseltir"""
+    while True:
+        if errors:
+            raise errors[0]
+        if not writer.is_alive():
+            raise RuntimeError("Yazıcı thread beklenmedik şekilde durdu")
+        try:
+            records.put(batch, timeout=1)
+            return
+        except queue.Full:
+            continue
+
+def build_outputs(sink, excel_path, csv_path):
+    # Geniş CSV, Excel ve Parquet çalıştırma sonunda bir kez kurulur
+    df = sink.to_wide(csv_path)
+    if df.empty:
+        return
+    write_excel(df, excel_path)
+    write_parquet(df, 'lisans', root=os.path.join(os.path.dirname(csv_path), 'parquet'))
 
 def main():
     excel_path, csv_path = create_folders()
@@ -309,27 +469,35 @@ def main():
     total_programs = len(programs)
     print(f"Toplam {total_programs} program bulundu.")
 
-    all_data = []
-    batch_size = 5  # Her 5 programda bir kaydet
-
-    with tqdm(total=total_programs, desc="Programlar işleniyor") as pbar:
-        for batch_idx in range(0, total_programs, batch_size):
-            batch_items = list(programs.items())[batch_idx:batch_idx + batch_size]
+    # Kayıtlar bellekte birikmez: yazıcı thread yalnızca yeni satırları uzun biçimli CSV'ye ekler
+    sink = LongFormatSink(csv_path.replace('.csv', '.long.csv'), ['Program', 'Üniversite Kodu'])
+    records = queue.Queue(maxsize=WRITE_QUEUE)
+    errors = []
+    writer = threading.Thread(target=write_records, args=(records, sink, errors))
+    writer.start()
 
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                futures = [
-                    executor.submit(process_program, prog_code, prog_name, all_data)
-                    for prog_code, prog_name in batch_items
-                ]
-
-                for _ in as_completed(futures):
-                    pbar.update(1)
+    index = YCodeIndex(Y_CODE_INDEX)
+    record_count = 0
+    try:
+        with tqdm(total=total_programs, desc="Programlar işleniyor") as pbar:
+            for program_code, program_records in crawl(programs, index):
+                put_records(records, program_records, writer, errors)
+                record_count += len(program_records)
+                pbar.update(1)
+    finally:
+        if not errors and writer.is_alive():
+            put_records(records, None, writer, errors)
+        writer.join()
+        index.close()
+    # Son kayıtlar yazılırken çıkan hata da kaybolmasın
+    if errors:
+        raise errors[0]
 
-            # Her batch sonunda kaydet
-            save_batch_data(all_data, excel_path, csv_path)
+    build_outputs(sink, excel_path, csv_path)
 
     print("\nTüm işlemler tamamlandı!")
-    print(f"Toplam {len(all_data)} kayıt toplandı.")
+    print(f"Toplam {record_count} kayıt toplandı ({len(index.claimed)} üniversite sayfası çekildi).")
+    export_metrics()
 
 if __name__ == "__main__":
     main()
@@ -338,118 +506,116 @@ if __name__ == "__main__":
 
 
 import requests
-from bs4 import BeautifulSoup
-import csv
 import time
 import pandas as pd
 from datetime import datetime
 import re
-import os
-import random
-
-def get_puan_turu(url, max_retries=3, initial_wait=2):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            title_tag = soup.find('title')
-
-            if title_tag:
-                title_text = title_tag.text.strip()
-                matches = re.findall(r'\((SAY|SÖZ|EA|DİL)\)', title_text)
-                if matches:
-                    return matches[0]
-
-            wait_time = initial_wait * (attempt + 1)
-            print(f"Veri alınamadı. {wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
-            time.sleep(wait_time)
-
-        except requests.exceptions.RequestException as e:
-            wait_time = initial_wait * (attempt + 1)
-            print(f"Bağlantı hatası: {e}")
-            print(f"{wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
-            time.sleep(wait_time)
-        except Exception as e:
-            print(f"Beklenmeyen hata: {e}")
-            wait_time = initial_wait * (attempt + 1)
-            print(f"{wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
-            time.sleep(wait_time)
 
-    print(f"Maksimum deneme sayısına ulaşıldı ({max_retries})")
+from yokatlas_common.cache import cached_get, discard_cached
+from yokatlas_common.client import get_session
+from yokatlas_common.parsing import extract_mydata_table, extract_title
+from yokatlas_common.columnar import ParquetSink
+from yokatlas_common.normalize import LISANS_SCHEMA
+from yokatlas_common.metrics import export_metrics
+from yokatlas_common.sinks import TableSink
+
+session = get_session()
+
+PUAN_TURU_RE = re.compile(r'\((SAY|SÖZ|EA|DİL)\)')
+
+def parse_puan_turu(content):
+    # Puan türü sayfa başlığında: "... (SAY)"
+    title_text = extract_title(content)
+    if title_text:
+        matches = PUAN_TURU_RE.findall(title_text)
+        if matches:
+            return matches[0]
     return None
 
-def get_table_data(url, puan_turu, max_retries=3, initial_wait=2):
+def table_rows(table, puan_turu):
+    all_data = []
+
+    # İlk iki satırı atlıyoruz (thead satırları da sayılır)
+    for cols in table.rows[max(0, 2 - table.header_row_count):]:
+        if len(cols) >= 12:
+            data = []
+
+            # Temel bilgiler (tüm puan türleri için ortak)
+            data.append(cols[1])  # Üniversite
+            data.append(cols[2])  # Yıl
+            data.append(cols[3])  # Tür
+            data.append(cols[4])  # Katsayı
+            data.append(cols[5])  # OBP
+            data.append(cols[6])  # Yerleşen Son Kişi Yerleştiği Puan
+            data.append(cols[7])  # Yerleşen
+            data.append(cols[8])  # TYT Türkçe
+            data.append(cols[9])  # TYT Sosyal
+            data.append(cols[10]) # TYT Mat
+            data.append(cols[11]) # TYT Fen
+
+            # Puan türüne göre ek sütunlar
+            if puan_turu == 'SAY':
+                data.append(cols[12])  # AYT Mat
+                data.append(cols[13])  # AYT Fizik
+                data.append(cols[14])  # AYT Kimya
+                data.append(cols[15])  # AYT Biyoloji
+            elif puan_turu == 'EA':
+                data.append(cols[12])  # AYT Mat
+                data.append(cols[13])  # AYT Türk Dili
+                data.append(cols[14])  # AYT Tarih1
+                data.append(cols[15])  # AYT Coğrafya1
+            elif puan_turu == 'SÖZ':
+                data.append(cols[12])  # AYT TDE
+                data.append(cols[13])  # AYT Tar1
+                data.append(cols[14])  # AYT Coğ1
+                data.append(cols[15])  # AYT Tar2
+                data.append(cols[16])  # AYT Coğ2
+                data.append(cols[17])  # AYT Fel
+                data.append(cols[18])  # AYT Din
+            elif puan_turu == 'DİL':
+                data.append(cols[12])  # YDT Dil
+
+            all_data.append(data)
+
+    return all_data
+
+def get_program_data(url, max_retries=3, initial_wait=2):
+    """netler-tablo.php'yi bir kez indirir; (puan türü, satırlar) döndürür
+
+    Puan türü başlıktan, satırlar aynı yanıttaki table#mydata'dan çıkarılır.
+    Puan türü bulunamazsa (None, []) döner.
+    """
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
 
+    puan_turu = None
     for attempt in range(max_retries):
+        if attempt:
+            # Önceki yanıt ayrıştırılamadı; önbellekteki kopya yerine yeniden indir
+            discard_cached(url)
         try:
-            response = requests.get(url, headers=headers)
+            response = cached_get(session.get, url, headers=headers)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            table = soup.find('table', {'id': 'mydata'})
-
-            if not table:
+            puan_turu = parse_puan_turu(response.content)
+            if not puan_turu:
                 wait_time = initial_wait * (attempt + 1)
-                print(f"Tablo bulunamadı. {wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
+                print(f"Veri alınamadı. {wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
                 time.sleep(wait_time)
                 continue
 
-            rows = table.find_all('tr')
-            all_data = []
+            table = extract_mydata_table(response.content)
 
-            for row in rows[2:]:  # İlk iki satırı atlıyoruz
-                cols = row.find_all('td')
-                if len(cols) >= 12:
-                    data = []
-
-                    # Temel bilgiler (tüm puan türleri için ortak)
-                    data.append(cols[1].text.strip())  # Üniversite
-                    data.append(cols[2].text.strip())  # Yıl
-                    data.append(cols[3].text.strip())  # Tür
-                    data.append(cols[4].text.strip())  # Katsayı
-                    data.append(cols[5].text.strip())  # OBP
-                    data.append(cols[6].text.strip())  # Yerleşen Son Kişi Yerleştiği Puan
-                    data.append(cols[7].text.strip())  # Yerleşen
-                    data.append(cols[8].text.strip())  # TYT Türkçe
-                    data.append(cols[9].text.strip())  # TYT Sosyal
-                    data.append(cols[10].text.strip()) # TYT Mat
-                    data.append(cols[11].text.strip()) # TYT Fen
-
-                    # Puan türüne göre ek sütunlar
-                    if puan_turu == 'SAY':
-                        data.append(cols[12].text.strip())  # AYT Mat
-                        data.append(cols[13].text.strip())  # AYT Fizik
-                        data.append(cols[14].text.strip())  # AYT Kimya
-                        data.append(cols[15].text.strip())  # AYT Biyoloji
-                    elif puan_turu == 'EA':
-                        data.append(cols[12].text.strip())  # AYT Mat
-                        data.append(cols[13].text.strip())  # AYT Türk Dili
-                        data.append(cols[14].text.strip())  # AYT Tarih1
-                        data.append(cols[15].text.strip())  # AYT Coğrafya1
-                    elif puan_turu == 'SÖZ':
-                        data.append(cols[12].text.strip())  # AYT TDE
-                        data.append(cols[13].text.strip())  # AYT Tar1
-                        data.append(cols[14].text.strip())  # AYT Coğ1
-                        data.append(cols[15].text.strip())  # AYT Tar2
-                        data.append(cols[16].text.strip())  # AYT Coğ2
-                        data.append(cols[17].text.strip())  # AYT Fel
-                        data.append(cols[18].text.strip())  # AYT Din
-                    elif puan_turu == 'DİL':
-                        data.append(cols[12].text.strip())  # YDT Dil
-
-                    all_data.append(data)
+            if table is None:
+                wait_time = initial_wait * (attempt + 1)
+                print(f"Tablo bulunamadı. {wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
+                time.sleep(wait_time)
+                continue
 
+            all_data = table_rows(table, puan_turu)
             if all_data:
-                return all_data
+                return puan_turu, all_data
 
             wait_time = initial_wait * (attempt + 1)
             print(f"Veri bulunamadı. {wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
@@ -466,8 +632,9 @@ def get_table_data(url, puan_turu, max_retries=3, initial_wait=2):
             print(f"{wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
             time.sleep(wait_time)
 
+    discard_cached(url)
     print(f"Maksimum deneme sayısına ulaşıldı ({max_retries})")
-    return []
+    return puan_turu, []
 
 def get_headers(puan_turu):
     base_headers = [
@@ -506,15 +673,19 @@ def get_headers(puan_turu):
 
     return base_headers
 
-def save_to_files(data, program_name, puan_turu):
-    headers = get_headers(puan_turu)
-
-    # Lisans klasörünü oluştur
-    os.makedirs('lisans', exist_ok=True)
+def open_sinks():
+    # Her puan türü için CSV + Excel dosyası çalıştırma boyunca açık kalır;
+    # aynı satırlar parquet/eskiler altına puan türü ve yıl bölümlü yazılır
+    return {
+        puan_turu: TableSink(f"lisans/{puan_turu.lower()}.csv", f"lisans/{puan_turu.lower()}.xlsx",
+                             get_headers(puan_turu),
+                             parquet=ParquetSink(get_headers(puan_turu), 'lisans', puan_turu, root='parquet/eskiler',
+                                                 schema=LISANS_SCHEMA))
+        for puan_turu in ['SAY', 'SÖZ', 'EA', 'DİL']
+    }
 
-    # Dosya isimleri
-    csv_filename = f"lisans/{puan_turu.lower()}.csv"
-    excel_filename = f"lisans/{puan_turu.lower()}.xlsx"
+def save_to_files(data, program_name, puan_turu, sinks):
+    headers = get_headers(puan_turu)
 
     # Program verilerini formatla
     formatted_data = []
@@ -526,45 +697,12 @@ def save_to_files(data, program_name, puan_turu):
             row.append('---')
         formatted_data.append(row)
 
-    # CSV'ye kaydet
+    # CSV ve Excel'e yalnızca yeni satırları ekle
     try:
-        if os.path.exists(csv_filename):
-            # Mevcut CSV'yi oku
-            existing_data = []
-            with open(csv_filename, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)  # Başlığı atla
-                existing_data = list(reader)
-
-            # Tüm veriyi yeni baştan yaz
-            with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)  # Başlıkları yaz
-                writer.writerows(existing_data)  # Mevcut verileri yaz
-                writer.writerows(formatted_data)  # Yeni verileri yaz
-        else:
-            # Yeni CSV oluştur
-            with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
-                writer.writerows(formatted_data)
-        print(f"CSV dosyası güncellendi: {csv_filename}")
+        sinks[puan_turu].write_rows(formatted_data)
+        print(f"Dosyalar güncellendi: lisans/{puan_turu.lower()}.csv, lisans/{puan_turu.lower()}.xlsx")
     except Exception as e:
-        print(f"CSV kaydedilirken hata: {e}")
-
-    # Excel'e kaydet
-    try:
-        if os.path.exists(excel_filename):
-            df_existing = pd.read_excel(excel_filename)
-            df_new = pd.DataFrame(formatted_data, columns=headers)
-            df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-        else:
-            df_combined = pd.DataFrame(formatted_data, columns=headers)
-
-        df_combined.to_excel(excel_filename, index=False, engine='openpyxl')
-        print(f"Excel dosyası güncellendi: {excel_filename}")
-    except Exception as e:
-        print(f"Excel kaydedilirken hata: {e}")
+        print(f"Kaydedilirken hata: {e}")
 
 def process_programs():
     # Lisans programlarını oku
@@ -581,14 +719,8 @@ def process_programs():
     # Tüm programlar için işlem yap
     test_programs = programs_df
 
-    # Lisans klasörünü oluştur
-    os.makedirs('lisans', exist_ok=True)
-
     # Dosyaları baştan oluştur
-    for puan_turu in ['SAY', 'SÖZ', 'EA', 'DİL']:
-        with open(f"lisans/{puan_turu.lower()}.csv", 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(get_headers(puan_turu))
+    sinks = open_sinks()
 
     total_programs = len(test_programs)
     start_time = datetime.now()
@@ -600,41 +732,39 @@ def process_programs():
     success_count = 0
     error_count = 0
 
-    for index, row in test_programs.iterrows():
-        program_name = row['Program Adı']
-        url = row['URL']
-
-        print(f"\nİşleniyor: {program_name} - {index+1}/{total_programs}")
-
-        try:
-            # Puan türünü belirle
-            puan_turu = get_puan_turu(url)
-            if puan_turu:
-                print(f"Puan Türü: {puan_turu}")
-
-                # Tablodan verileri al
-                program_data = get_table_data(url, puan_turu)
-
-                if program_data:
-                    # Verileri kaydet
-                    save_to_files(program_data, program_name, puan_turu)
-                    counters[puan_turu] += len(program_data)
-                    print(f"Veri kaydedildi: {len(program_data)} satır")
-                    success_count += 1
+    try:
+        for index, row in test_programs.iterrows():
+            program_name = row['Program Adı']
+            url = row['URL']
+
+            print(f"\nİşleniyor: {program_name} - {index+1}/{total_programs}")
+
+            try:
+                # Puan türü ve tablo aynı sayfadan, tek istekle
+                puan_turu, program_data = get_program_data(url)
+                if puan_turu:
+                    print(f"Puan Türü: {puan_turu}")
+
+                    if program_data:
+                        # Verileri kaydet
+                        save_to_files(program_data, program_name, puan_turu, sinks)
+                        counters[puan_turu] += len(program_data)
+                        print(f"Veri kaydedildi: {len(program_data)} satır")
+                        success_count += 1
+                    else:
+                        print("Veri bulunamadı!")
+                        error_count += 1
                 else:
-                    print("Veri bulunamadı!")
+                    print("Puan türü belirlenemedi!")
                     error_count += 1
-            else:
-                print("Puan türü belirlenemedi!")
-                error_count += 1
-
-        except Exception as e:
-            print(f"Hata: {program_name} işlenirken hata oluştu: {e}")
-            error_count += 1
 
-        # Rastgele bekleme süresi (1-3 saniye arası)
-        wait_time = 1 + random.random() * 2
-        time.sleep(wait_time)
+            except Exception as e:
+                print(f"Hata: {program_name} işlenirken hata oluştu: {e}")
+                error_count += 1
+    finally:
+        # Excel dosyaları burada bir kez yazılır
+        for sink in sinks.values():
+            sink.close()
 
     end_time = datetime.now()
     total_time = end_time - start_time
@@ -650,6 +780,7 @@ def process_programs():
         print(f"{puan_turu}: {count} satır")
     print(f"\nToplam geçen süre: {total_time}")
     print("="*50)
+    export_metrics()
 
 if __name__ == "__main__":
     try:
@@ -670,191 +801,177 @@ if __name__ == "__main__":
 
 
 import requests
-from bs4 import BeautifulSoup
 import csv
-import time
 import urllib3
 
+from yokatlas_common import BASE_URL
+from yokatlas_common.catalog import load_netler_catalog
+from yokatlas_common.client import get_session
+
 # SSL uyarılarını kapat
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-url = "https://yokatlas.yok.gov.tr/netler.php"
+session = get_session()
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
-try:
-    # SSL doğrulamasını kapatarak isteği yap
-    response = requests.get(url, headers=headers, verify=False, timeout=10)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-
-    # Lisans programları select
-    lisans_select = soup.find('select', {'id': 'bolum'})
-    if not lisans_select:
-        raise Exception("Lisans programları bulunamadı!")
-    lisans_options = lisans_select.find_all('option')
-
-    # Önlisans programları select
-    onlisans_select = soup.find('select', {'id': 'program'})
-    if not onlisans_select:
-        raise Exception("Önlisans programları bulunamadı!")
-    onlisans_options = onlisans_select.find_all('option')
-
-    # Lisans CSV yaz
-    with open('lisans_programlari.csv', 'w', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        writer.writerow(['Program Adı', 'URL'])
-
-        for option in lisans_options:
-            if option.get('value'):
-                program_adi = option.text.strip()
-                program_kodu = option.get('value')
-                detail_url = f"https://yokatlas.yok.gov.tr/netler-tablo.php?b={program_kodu}"
+def save_program_catalogs():
+    try:
+        # netler.php tek seferde indirilip ayrıştırılır, sonuç diskte önbelleklenir.
+        # SSL doğrulamasını kapatarak isteği yap
+        catalog = load_netler_catalog(session.get, headers=headers, verify=False)
+
+        lisans_programs = catalog['lisans']
+        if not lisans_programs:
+            raise Exception("Lisans programları bulunamadı!")
+
+        onlisans_programs = catalog['onlisans']
+        if not onlisans_programs:
+            raise Exception("Önlisans programları bulunamadı!")
+
+        # Lisans CSV yaz
+        with open('lisans_programlari.csv', 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Program Adı', 'URL'])
+
+            for program in lisans_programs:
+                program_adi = program['program_adi']
+                detail_url = f"{BASE_URL}/netler-tablo.php?b={program['kod']}"
                 writer.writerow([program_adi, detail_url])
                 print(f"Lisans: {program_adi} kaydedildi.")
 
-    # Önlisans CSV yaz
-    with open('onlisans_programlari.csv', 'w', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        writer.writerow(['Program Adı', 'URL'])
+        # Önlisans CSV yaz
+        with open('onlisans_programlari.csv', 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Program Adı', 'URL'])
 
-        for option in onlisans_options:
-            if option.get('value'):
-                program_adi = option.text.strip()
-                program_kodu = option.get('value')
-                detail_url = f"https://yokatlas.yok.gov.tr/netler-onlisans-tablo.php?b={program_kodu}"
+            for program in onlisans_programs:
+                program_adi = program['program_adi']
+                detail_url = f"{BASE_URL}/netler-onlisans-tablo.php?b={program['kod']}"
                 writer.writerow([program_adi, detail_url])
                 print(f"Önlisans: {program_adi} kaydedildi.")
 
-    print("\nİşlem başarıyla tamamlandı!")
-    print(f"Toplam {len(lisans_options)-1} lisans ve {len(onlisans_options)-1} önlisans programı kaydedildi.")
+        print("\nİşlem başarıyla tamamlandı!")
+        print(f"Toplam {len(lisans_programs)} lisans ve {len(onlisans_programs)} önlisans programı kaydedildi.")
 
-except requests.RequestException as e:
-    print(f"Bağlantı hatası: {e}")
-except Exception as e:
-    print(f"Bir hata oluştu: {e}")
+    except requests.RequestException as e:
+        print(f"Bağlantı hatası: {e}")
+    except Exception as e:
+        print(f"Bir hata oluştu: {e}")
+
+if __name__ == "__main__":
+    save_program_catalogs()
 
 
 #################################
 
 
 
-import requests
-from bs4 import BeautifulSoup
-import csv
 import time
 import pandas as pd
-from datetime import datetime
 import re
-import os
-import random
 import urllib3
 
-# SSL uyarılarını kapat
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-def get_puan_turu(url, max_retries=3, initial_wait=2):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=headers, verify=False, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            title_tag = soup.find('title')
+from yokatlas_common.cache import cached_get, discard_cached
+from yokatlas_common.client import get_session
+from yokatlas_common.parsing import extract_mydata_table, extract_title
+from yokatlas_common.columnar import ParquetSink
+from yokatlas_common.normalize import LISANS_SCHEMA
+from yokatlas_common.metrics import export_metrics
+from yokatlas_common.sinks import TableSink
 
-            if title_tag:
-                title_text = title_tag.text.strip()
-                matches = re.findall(r'\((SAY|SÖZ|EA|DİL)\)', title_text)
-                if matches:
-                    return matches[0]
+session = get_session()
 
-            wait_time = initial_wait * (attempt + 1)
-            print(f"Veri alınamadı. {wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
-            time.sleep(wait_time)
+# SSL uyarılarını kapat
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-        except requests.exceptions.RequestException as e:
-            wait_time = initial_wait * (attempt + 1)
-            print(f"Bağlantı hatası: {e}")
-            print(f"{wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
-            time.sleep(wait_time)
-        except Exception as e:
-            print(f"Beklenmeyen hata: {e}")
-            wait_time = initial_wait * (attempt + 1)
-            print(f"{wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
-            time.sleep(wait_time)
+PUAN_TURU_RE = re.compile(r'\((SAY|SÖZ|EA|DİL)\)')
 
-    print(f"Maksimum deneme sayısına ulaşıldı ({max_retries})")
+def parse_puan_turu(content):
+    title_text = extract_title(content)
+    if title_text:
+        matches = PUAN_TURU_RE.findall(title_text)
+        if matches:
+            return matches[0]
     return None
 
-def get_table_data(url, puan_turu, max_retries=3, initial_wait=2):
+def table_rows(table, puan_turu):
+    all_data = []
+
+    for cols in table.rows[max(0, 2 - table.header_row_count):]:
+        if len(cols) >= 10:
+            data = []
+
+            data.append(cols[1])
+            data.append(cols[2])
+            data.append(cols[3])
+            data.append(cols[4])
+            data.append(cols[5])
+            data.append(cols[7])
+            data.append(cols[8])
+            data.append(cols[9])
+            data.append(cols[10])
+            data.append(cols[11])
+
+            if puan_turu == 'SAY':
+                data.append(cols[12])
+                data.append(cols[13])
+                data.append(cols[14])
+                data.append(cols[15])
+            elif puan_turu == 'EA':
+                data.append(cols[12])
+                data.append(cols[13])
+                data.append(cols[14])
+                data.append(cols[15])
+            elif puan_turu == 'SÖZ':
+                data.append(cols[12])
+                data.append(cols[13])
+                data.append(cols[14])
+                data.append(cols[15])
+                data.append(cols[16])
+                data.append(cols[17])
+                data.append(cols[18])
+            elif puan_turu == 'DİL':
+                data.append(cols[12])
+
+            all_data.append(data)
+
+    return all_data
+
+def get_program_data(url, max_retries=3, initial_wait=2):
+    """Sayfayı bir kez indirir; (puan türü, satırlar) döndürür"""
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
 
+    puan_turu = None
     for attempt in range(max_retries):
+        if attempt:
+            # Önceki yanıt ayrıştırılamadı; önbellekteki kopya yerine yeniden indir
+            discard_cached(url)
         try:
-            response = requests.get(url, headers=headers, verify=False, timeout=10)
+            response = cached_get(session.get, url, headers=headers, verify=False, timeout=10)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            table = soup.find('table', {'id': 'mydata'})
-
-            if not table:
+            puan_turu = parse_puan_turu(response.content)
+            if not puan_turu:
                 wait_time = initial_wait * (attempt + 1)
-                print(f"Tablo bulunamadı. {wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
+                print(f"Veri alınamadı. {wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
                 time.sleep(wait_time)
                 continue
 
-            rows = table.find_all('tr')
-            all_data = []
+            table = extract_mydata_table(response.content)
 
-            for row in rows[2:]:
-                cols = row.find_all('td')
-                if len(cols) >= 10:
-                    data = []
-
-                    data.append(cols[1].text.strip())
-                    data.append(cols[2].text.strip())
-                    data.append(cols[3].text.strip())
-                    data.append(cols[4].text.strip())
-                    data.append(cols[5].text.strip())
-                    data.append(cols[7].text.strip())
-                    data.append(cols[8].text.strip())
-                    data.append(cols[9].text.strip())
-                    data.append(cols[10].text.strip())
-                    data.append(cols[11].text.strip())
-
-                    if puan_turu == 'SAY':
-                        data.append(cols[12].text.strip())
-                        data.append(cols[13].text.strip())
-                        data.append(cols[14].text.strip())
-                        data.append(cols[15].text.strip())
-                    elif puan_turu == 'EA':
-                        data.append(cols[12].text.strip())
-                        data.append(cols[13].text.strip())
-                        data.append(cols[14].text.strip())
-                        data.append(cols[15].text.strip())
-                    elif puan_turu == 'SÖZ':
-                        data.append(cols[12].text.strip())
-                        data.append(cols[13].text.strip())
-                        data.append(cols[14].text.strip())
-                        data.append(cols[15].text.strip())
-                        data.append(cols[16].text.strip())
-                        data.append(cols[17].text.strip())
-                        data.append(cols[18].text.strip())
-                    elif puan_turu == 'DİL':
-                        data.append(cols[12].text.strip())
-
-                    all_data.append(data)
+            if table is None:
+                wait_time = initial_wait * (attempt + 1)
+                print(f"Tablo bulunamadı. {wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
+                time.sleep(wait_time)
+                continue
 
+            all_data = table_rows(table, puan_turu)
             if all_data:
-                return all_data
+                return puan_turu, all_data
 
             wait_time = initial_wait * (attempt + 1)
             print(f"Veri bulunamadı. {wait_time} saniye bekleniyor... (Deneme {attempt + 1}/{max_retries})")
@@ -865,7 +982,8 @@ def get_table_data(url, puan_turu, max_retries=3, initial_wait=2):
             print(f"Hata: {e} - {wait_time} saniye bekleniyor")
             time.sleep(wait_time)
 
-    return []
+    discard_cached(url)
+    return puan_turu, []
 
 def get_headers(puan_turu):
     base_headers = [
@@ -890,13 +1008,17 @@ def get_headers(puan_turu):
 
     return base_headers
 
-def save_to_files(data, program_name, puan_turu):
-    headers = get_headers(puan_turu)
-
-    os.makedirs('lisans', exist_ok=True)
+def open_sinks():
+    return {
+        puan_turu: TableSink(f"lisans/{puan_turu.lower()}.csv", f"lisans/{puan_turu.lower()}.xlsx",
+                             get_headers(puan_turu),
+                             parquet=ParquetSink(get_headers(puan_turu), 'lisans', puan_turu, root='parquet/eskiler',
+                                                 schema=LISANS_SCHEMA))
+        for puan_turu in ['SAY', 'SÖZ', 'EA', 'DİL']
+    }
 
-    csv_filename = f"lisans/{puan_turu.lower()}.csv"
-    excel_filename = f"lisans/{puan_turu.lower()}.xlsx"
+def save_to_files(data, program_name, puan_turu, sinks):
+    headers = get_headers(puan_turu)
 
     formatted_data = []
     for row in data:
@@ -906,40 +1028,10 @@ def save_to_files(data, program_name, puan_turu):
         formatted_data.append(row)
 
     try:
-        if os.path.exists(csv_filename):
-            existing_data = []
-            with open(csv_filename, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)
-                existing_data = list(reader)
-
-            with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
-                writer.writerows(existing_data)
-                writer.writerows(formatted_data)
-        else:
-            with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
-                writer.writerows(formatted_data)
-
-        print(f"CSV güncellendi: {csv_filename}")
-    except Exception as e:
-        print(f"CSV hata: {e}")
-
-    try:
-        if os.path.exists(excel_filename):
-            df_existing = pd.read_excel(excel_filename)
-            df_new = pd.DataFrame(formatted_data, columns=headers)
-            df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-        else:
-            df_combined = pd.DataFrame(formatted_data, columns=headers)
-
-        df_combined.to_excel(excel_filename, index=False, engine='openpyxl')
-        print(f"Excel güncellendi: {excel_filename}")
+        sinks[puan_turu].write_rows(formatted_data)
+        print(f"Güncellendi: lisans/{puan_turu.lower()}.csv")
     except Exception as e:
-        print(f"Excel hata: {e}")
+        print(f"Kayıt hata: {e}")
 
 def process_programs():
     try:
@@ -950,45 +1042,42 @@ def process_programs():
 
     test_programs = programs_df
 
-    os.makedirs('lisans', exist_ok=True)
-
-    for puan_turu in ['SAY', 'SÖZ', 'EA', 'DİL']:
-        with open(f"lisans/{puan_turu.lower()}.csv", 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(get_headers(puan_turu))
+    sinks = open_sinks()
 
     total_programs = len(test_programs)
     counters = {'SAY': 0, 'SÖZ': 0, 'EA': 0, 'DİL': 0}
 
-    for index, row in test_programs.iterrows():
-        program_name = row['Program Adı']
-        url = row['URL']
-
-        print(f"\nİşleniyor: {program_name} - {index+1}/{total_programs}")
+    try:
+        for index, row in test_programs.iterrows():
+            program_name = row['Program Adı']
+            url = row['URL']
 
-        try:
-            puan_turu = get_puan_turu(url)
-            if not puan_turu:
-                print("Puan türü bulunamadı!")
-                continue
+            print(f"\nİşleniyor: {program_name} - {index+1}/{total_programs}")
 
-            print(f"Puan Türü: {puan_turu}")
+            try:
+                puan_turu, program_data = get_program_data(url)
+                if not puan_turu:
+                    print("Puan türü bulunamadı!")
+                    continue
 
-            program_data = get_table_data(url, puan_turu)
-            if not program_data:
-                print("Tablo verisi boş!")
-                continue
+                print(f"Puan Türü: {puan_turu}")
 
-            save_to_files(program_data, program_name, puan_turu)
-            counters[puan_turu] += len(program_data)
+                if not program_data:
+                    print("Tablo verisi boş!")
+                    continue
 
-        except Exception as e:
-            print(f"Hata: {e}")
+                save_to_files(program_data, program_name, puan_turu, sinks)
+                counters[puan_turu] += len(program_data)
 
-        time.sleep(1 + random.random() * 2)
+            except Exception as e:
+                print(f"Hata: {e}")
+    finally:
+        for sink in sinks.values():
+            sink.close()
 
     print("\nBitti!")
     print(counters)
+    export_metrics()
 
 if __name__ == "__main__":
     process_programs()
@@ -997,14 +1086,19 @@ if __name__ == "__main__":
 #######################
 
 
-import requests
-from bs4 import BeautifulSoup
-import csv
 import time
-import os
 import pandas as pd
 import urllib3
-import random
+
+from yokatlas_common.cache import cached_get, discard_cached
+from yokatlas_common.client import get_session
+from yokatlas_common.parsing import extract_mydata_table
+from yokatlas_common.columnar import ParquetSink
+from yokatlas_common.normalize import ONLISANS_SCHEMA
+from yokatlas_common.metrics import export_metrics
+from yokatlas_common.sinks import TableSink
+
+session = get_session()
 
 # SSL uyarılarını kapat (YÖK Atlas sertifika hataları için)
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -1040,32 +1134,27 @@ def get_onlisans_table(url, max_retries=3):
     }
 
     for attempt in range(max_retries):
+        if attempt:
+            # Önceki yanıt ayrıştırılamadı; önbellekteki kopya yerine yeniden indir
+            discard_cached(url)
         try:
-            resp = requests.get(url, headers=headers_req, verify=False, timeout=10)
+            resp = cached_get(session.get, url, headers=headers_req, verify=False, timeout=10)
             resp.raise_for_status()
 
-            soup = BeautifulSoup(resp.text, "html.parser")
-            table = soup.find("table", {"id": "mydata"})
+            table = extract_mydata_table(resp.content)
 
-            if not table:
+            if table is None:
                 print("Tablo bulunamadı, yeniden denenecek...")
                 time.sleep(2)
                 continue
 
             # --- THEAD'den kolon indexlerini çıkar ---
-            thead = table.find("thead")
-            if not thead:
-                print("Thead bulunamadı, atlanıyor.")
-                return []
-
-            header_rows = thead.find_all("tr")
-            if not header_rows:
-                print("Header satırı bulunamadı.")
+            if not table.header_row_count:
+                print("Thead veya header satırı bulunamadı, atlanıyor.")
+                discard_cached(url)
                 return []
 
-            first_header = header_rows[0]
-            th_list = first_header.find_all("th")
-            header_texts = [th.get_text(strip=True) for th in th_list]
+            header_texts = table.headers
 
             idx_uni      = get_col_index(header_texts, "Üniversite")
             idx_yil      = get_col_index(header_texts, "Yılı")
@@ -1084,20 +1173,13 @@ def get_onlisans_table(url, max_retries=3):
             if any(i is None for i in needed):
                 print("Bazı kolon indexleri bulunamadı, header yapısı değişmiş olabilir.")
                 print("Header textleri:", header_texts)
+                discard_cached(url)
                 return []
 
-            # --- Tbody'den verileri oku ---
-            tbody = table.find("tbody")
-            if tbody:
-                rows = tbody.find_all("tr")
-            else:
-                # Bazı tablolarda tbody olmayabiliyor
-                rows = table.find_all("tr")[2:]
-
+            # --- Tbody'den verileri oku (tbody yoksa thead dışındaki satırlar) ---
             all_data = []
 
-            for row in rows:
-                cols = row.find_all("td")
+            for cols in table.rows:
                 if not cols:
                     continue
 
@@ -1106,16 +1188,16 @@ def get_onlisans_table(url, max_retries=3):
                 if len(cols) <= max_idx:
                     continue
 
-                uni       = cols[idx_uni].get_text(strip=True)
-                yil       = cols[idx_yil].get_text(strip=True)
-                tur       = cols[idx_tur].get_text(strip=True)
-                katsayi   = cols[idx_katsayi].get_text(strip=True)
-                obp       = cols[idx_obp].get_text(strip=True)
-                yerlesen  = cols[idx_yerlesen].get_text(strip=True)
-                tyt_tr    = cols[idx_tyt_tr].get_text(strip=True)
-                tyt_sos   = cols[idx_tyt_sos].get_text(strip=True)
-                tyt_mat   = cols[idx_tyt_mat].get_text(strip=True)
-                tyt_fen   = cols[idx_tyt_fen].get_text(strip=True)
+                uni       = cols[idx_uni]
+                yil       = cols[idx_yil]
+                tur       = cols[idx_tur]
+                katsayi   = cols[idx_katsayi]
+                obp       = cols[idx_obp]
+                yerlesen  = cols[idx_yerlesen]
+                tyt_tr    = cols[idx_tyt_tr]
+                tyt_sos   = cols[idx_tyt_sos]
+                tyt_mat   = cols[idx_tyt_mat]
+                tyt_fen   = cols[idx_tyt_fen]
 
                 data_row = [
                     uni,
@@ -1138,38 +1220,17 @@ def get_onlisans_table(url, max_retries=3):
             print(f"Hata: {e} (deneme {attempt+1}/{max_retries})")
             time.sleep(2)
 
+    discard_cached(url)
     return []
 
-def save_onlisans(program_name, table_data):
-    os.makedirs("onlisans", exist_ok=True)
-
-    csv_filename   = "onlisans/onlisans.csv"
-    excel_filename = "onlisans/onlisans.xlsx"
-
+def save_onlisans(program_name, table_data, sink):
     formatted = []
     for row in table_data:
         # Program Adı en başa
         formatted.append([program_name] + row)
 
-    # CSV
-    if not os.path.exists(csv_filename):
-        with open(csv_filename, "w", newline="", encoding="utf-8-sig") as f:
-            writer = csv.writer(f)
-            writer.writerow(ONLISANS_HEADERS)
-
-    with open(csv_filename, "a", newline="", encoding="utf-8-sig") as f:
-        writer = csv.writer(f)
-        writer.writerows(formatted)
-
-    # Excel
-    if os.path.exists(excel_filename):
-        df_old = pd.read_excel(excel_filename)
-        df_new = pd.DataFrame(formatted, columns=ONLISANS_HEADERS)
-        df_all = pd.concat([df_old, df_new], ignore_index=True)
-    else:
-        df_all = pd.DataFrame(formatted, columns=ONLISANS_HEADERS)
-
-    df_all.to_excel(excel_filename, index=False, engine="openpyxl")
+    # CSV ve Excel'e yalnızca yeni satırlar eklenir
+    sink.write_rows(formatted)
 
 def process_onlisans():
     # onlisans_programlari.csv: Program Adı, URL
@@ -1182,23 +1243,26 @@ def process_onlisans():
     total = len(df)
     print(f"Toplam Önlisans Programı: {total}")
 
-    for i, row in df.iterrows():
-        program_name = row["Program Adı"]
-        url          = row["URL"]
-
-        print(f"\n{i+1}/{total} → {program_name}")
-        table_data = get_onlisans_table(url)
-
-        if table_data:
-            save_onlisans(program_name, table_data)
-            print(f"✓ {len(table_data)} satır kaydedildi.")
-        else:
-            print("✗ Veri bulunamadı veya header uyumsuz.")
-
-        # YÖK Atlas'a yüklenmemek için küçük delay
-        time.sleep(1 + random.random() * 2)
+    # Önceki çalıştırmaların satırları korunur; Excel sonda bir kez yazılır
+    with TableSink("onlisans/onlisans.csv", "onlisans/onlisans.xlsx", ONLISANS_HEADERS,
+                   append=True, encoding="utf-8-sig",
+                   parquet=ParquetSink(ONLISANS_HEADERS, 'onlisans', 'TYT', root='parquet/eskiler',
+                                       append=True, schema=ONLISANS_SCHEMA)) as sink:
+        for i, row in df.iterrows():
+            program_name = row["Program Adı"]
+            url          = row["URL"]
+
+            print(f"\n{i+1}/{total} → {program_name}")
+            table_data = get_onlisans_table(url)
+
+            if table_data:
+                save_onlisans(program_name, table_data, sink)
+                print(f"✓ {len(table_data)} satır kaydedildi.")
+            else:
+                print("✗ Veri bulunamadı veya header uyumsuz.")
 
     print("\nİşlem tamamlandı.")
+    export_metrics()
 
 if __name__ == "__main__":
     process_onlisans()
@@ -1,15 +1,23 @@
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-import time
-import re
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+from yokatlas_common import BASE_URL
+from yokatlas_common.aio import fetch_all, run_sync
+from yokatlas_common.cache import cached_get, discard_cached
+from yokatlas_common.catalog import load_netler_catalog
+from yokatlas_common.checkpoint import CheckpointStore
+from yokatlas_common.client import create_session
+from yokatlas_common.columnar import infer_puan_turu, write_parquet
+from yokatlas_common.metrics import METRICS, export_metrics
+from yokatlas_common.normalize import LISANS_SCHEMA, normalize_frame
+from yokatlas_common.parsing import extract_university_code, mydata_digest, parse_netler_table
+from yokatlas_common.sinks import write_excel
 
 class YokAtlasNetScraper:
     def __init__(self):
-        self.base_url = "https://yokatlas.yok.gov.tr"
-        self.session = requests.Session()
+        self.base_url = BASE_URL
+        self.session = create_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -17,30 +25,15 @@ class YokAtlasNetScraper:
     def get_lisans_programs(self):
         """Lisans programlarını çeker"""
         print("Lisans programları çekiliyor...")
-        url = f"{self.base_url}/netler.php"
 
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Lisans programlarını bul
-            select_element = soup.find('select', {'id': 'bolum'})
+            # netler.php tek seferde ayrıştırılır ve diskte önbelleklenir
+            programs = load_netler_catalog(self.session.get, self.base_url)['lisans']
 
-            if not select_element:
+            if not programs:
                 print("Lisans programları bulunamadı!")
                 return []
 
-            programs = []
-            for option in select_element.find_all('option'):
-                value = option.get('value')
-                text = option.text.strip()
-                if value:
-                    programs.append({
-                        'kod': value,
-                        'program_adi': text
-                    })
-
             print(f"{len(programs)} adet lisans programı bulundu.")
             return programs
 
@@ -51,100 +44,61 @@ class YokAtlasNetScraper:
     def extract_university_code(self, link_element):
         """Link elementinden üniversite kodunu çeker"""
         if link_element:
-            href = link_element.get('href', '')
-            # lisans.php?y=103390230 formatından 103390230'u çek
-            match = re.search(r'y=(\d+)', href)
-            if match:
-                return match.group(1)
+            return extract_university_code(link_element.get('href', ''))
         return ''
 
     def scrape_program_data(self, program_code, program_name):
         """Belirli bir program için net verilerini çeker"""
         print(f"\n'{program_name}' programı işleniyor... (Kod: {program_code})")
-        url = f"{self.base_url}/netler-tablo.php?b={program_code}"
+        url = self.program_url(program_code)
 
         try:
-            response = self.session.get(url, timeout=10)
+            response = cached_get(self.session.get, url, timeout=10)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+        except Exception as e:
+            print(f"  ✗ Hata: {e}")
+            return None
 
-            table = soup.find('table', {'id': 'mydata'})
+        df = self.parse_program_data(response.content, program_code, program_name)
+        if df is None:
+            # Tablosuz/boş sayfa önbellekte kalmasın
+            discard_cached(url)
+        return df
 
-            if not table:
-                print(f"  Tablo bulunamadı!")
-                return None
+    def program_url(self, program_code):
+        """Programın net tablosu adresini döndürür"""
+        return f"{self.base_url}/netler-tablo.php?b={program_code}"
 
-            # Başlıkları al
-            headers = []
-            thead = table.find('thead')
-            if thead:
-                header_row = thead.find('tr')
-                th_list = header_row.find_all('th')
-
-                for idx, th in enumerate(th_list):
-                    header_text = th.text.strip()
-
-                    # Boş başlıkları kontrol et - bu 7. sütundaki boş başlık
-                    if (header_text == '' or header_text == ' ' or header_text == '\xa0' or header_text == '&nbsp;'):
-                        # Eğer bir önceki başlık "Yerleşen Son Kişi" ise, bu katsayılı puan sütunudur
-                        if idx > 0 and 'Yerleşen Son Kişi' in th_list[idx-1].text:
-                            header_text = '0.12 Katsayı ile Yerleşen Son Kişinin Puanı'
-                        else:
-                            header_text = f'Boş_Sütun_{idx}'
-
-                    # Eğer aynı isimli sütun varsa, sonuna sayı ekle
-                    original_header = header_text
-                    counter = 1
-                    while header_text in headers:
-                        header_text = f"{original_header}_{counter}"
-                        counter += 1
-
-                    headers.append(header_text)
-
-            # Satırları al
-            data_rows = []
-            tbody = table.find('tbody')
-            if tbody:
-                for row in tbody.find_all('tr'):
-                    cells = row.find_all('td')
-                    row_data = []
-                    university_code = ''
-
-                    for idx, cell in enumerate(cells):
-                        # Link içindeki metni al
-                        link = cell.find('a')
-                        if link:
-                            text = link.text.strip()
-                            # İlk link genelde üniversite linki, ondan kodu çek
-                            if idx == 1:  # İkinci sütun genelde üniversite
-                                university_code = self.extract_university_code(link)
-                        else:
-                            text = cell.text.strip()
-                        row_data.append(text)
-
-                    if len(row_data) > 1:  # Boş satırları atla
-                        # Üniversite kodunu row_data'ya ekle (en başa)
-                        row_data.insert(1, university_code)  # İlk boş sütundan sonra
-                        data_rows.append(row_data)
-
-            if not data_rows:
-                print(f"  Veri bulunamadı!")
-                return None
+    def parse_program_data(self, content, program_code, program_name):
+        """İndirilmiş net tablosu sayfasını DataFrame'e çevirir"""
+        try:
+            parsed = parse_netler_table(content)
+        except Exception as e:
+            print(f"  ✗ Hata: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
 
-            # Üniversite Kodu başlığını ekle
-            headers.insert(1, 'Üniversite Kodu')  # İlk boş sütundan sonra
+        return self.build_program_frame(parsed, program_code, program_name)
+
+    def build_program_frame(self, parsed, program_code, program_name):
+        """parse_netler_table çıktısından (headers, rows) programın DataFrame'ini kurar"""
+        if parsed is None:
+            print(f"  Tablo bulunamadı!")
+            return None
+
+        headers, data_rows = parsed
+        if not data_rows:
+            print(f"  Veri bulunamadı!")
+            return None
 
+        try:
             # Sütun sayısını kontrol et ve düzelt
             header_count = len(headers)
-            for i, row in enumerate(data_rows):
-                if len(row) != header_count:
-                    # Eksik sütunları boş değerle doldur
-                    while len(row) < header_count:
-                        row.append('')
-                    # Fazla sütunları kırp
-                    if len(row) > header_count:
-                        row = row[:header_count]
-                    data_rows[i] = row
+            data_rows = [
+                row[:header_count] if len(row) >= header_count else row + ('',) * (header_count - len(row))
+                for row in data_rows
+            ]
 
             # DataFrame oluştur
             df = pd.DataFrame(data_rows, columns=headers)
@@ -158,6 +112,9 @@ class YokAtlasNetScraper:
             df.insert(0, 'Program Kodu', program_code)
             df.insert(0, 'Program Adı', program_name)
 
+            # Puan, net ve yerleşen sütunları sayısal tiplere çevrilir
+            df = normalize_frame(df, LISANS_SCHEMA)
+
             print(f"  ✓ {len(df)} satır, {len(df.columns)} sütun")
             return df
 
@@ -175,63 +132,260 @@ class YokAtlasNetScraper:
         # Tüm sütunları birleştir
         combined_df = pd.concat(all_data, ignore_index=True, sort=False)
 
-        # NaN değerleri boş string ile değiştir
-        combined_df = combined_df.fillna('')
-
-        combined_df.to_csv(filename, index=False, encoding='utf-8-sig')
+        # Boş (NA) hücreler boş yazılır; ondalık ayırıcı Türkçe biçimdeki gibi virgül
+        with METRICS.timer('yokatlas_write_seconds', sink='csv'):
+            combined_df.to_csv(filename, index=False, encoding='utf-8-sig', na_rep='', decimal=',')
+        METRICS.inc('yokatlas_rows_written_total', len(combined_df), sink='csv')
         print(f"\n✓ CSV: {filename}")
         print(f"  - {len(combined_df)} satır")
         print(f"  - {len(combined_df.columns)} sütun")
         return combined_df
 
+    def save_delta(self, delta, filename='yokatlas_netler_delta.csv'):
+        """Artımlı modda yeni/değişen satırları ayrı CSV'ye kaydet (değişiklik yoksa yalnız başlık)"""
+        if delta:
+            delta_df = pd.concat(delta, ignore_index=True, sort=False)
+            delta_df = delta_df[['Değişiklik'] + [column for column in delta_df.columns if column != 'Değişiklik']]
+        else:
+            delta_df = pd.DataFrame(columns=['Değişiklik'])
+
+        delta_df.to_csv(filename, index=False, encoding='utf-8-sig', na_rep='', decimal=',')
+        print(f"\n✓ Delta CSV: {filename}")
+        print(f"  - {len(delta_df)} yeni/değişen satır")
+
+    def save_to_parquet(self, all_data, root='parquet/netler'):
+        """Program tablolarını puan türü ve yıl bölümlü Parquet olarak kaydet"""
+        if not all_data:
+            return
+
+        # Programlar sütunlarına göre puan türüne ayrılır
+        groups = {}
+        for df in all_data:
+            groups.setdefault(infer_puan_turu(df.columns), []).append(df)
+
+        for puan_turu, frames in groups.items():
+            write_parquet(pd.concat(frames, ignore_index=True, sort=False), 'lisans', puan_turu, root)
+        print(f"\n✓ Parquet: {root} ({', '.join(sorted(groups))})")
+
     def save_to_excel(self, df, filename='yokatlas_netler.xlsx'):
-        """Verileri Excel'e kaydet"""
+        """Verileri Excel'e kaydet (xlsxwriter constant_memory ile tek geçişte)"""
         if df is None or df.empty:
             return
 
         print(f"\n✓ Excel: {filename}")
+        write_excel(df, filename, sheet_name='Netler')
 
-        # NaN değerleri boş string ile değiştir
-        df = df.fillna('')
+    def scrape_programs(self, programs, checkpoint=None):
+        """Programları sırayla çeker (bekleme ortak hız sınırlayıcıda)
+
+        checkpoint verilirse her programın satırları biter bitmez kaydedilir.
+        """
+        all_data = []
+        success_count = 0
+        fail_count = 0
 
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Netler', index=False)
+        # Her program için veri çek
+        for i, program in enumerate(programs, 1):
+            print(f"\n[{i}/{len(programs)}] ", end="")
+            df = self.scrape_program_data(program['kod'], program['program_adi'])
 
-            workbook = writer.book
-            worksheet = writer.sheets['Netler']
+            if df is not None:
+                all_data.append(df)
+                success_count += 1
+                if checkpoint is not None:
+                    checkpoint.save(program['kod'], program['program_adi'], df)
+            else:
+                fail_count += 1
 
-            # Başlık formatı
-            header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-            header_font = Font(bold=True, color='FFFFFF', size=11)
+        return all_data, success_count, fail_count
 
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    async def scrape_programs_async(self, programs, concurrency, parse_workers=None, checkpoint=None):
+        """Programları `concurrency` eşzamanlı istekle çeker
 
-            # Sütun genişliklerini ayarla
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
+        Gelen sayfalar ayrıştırılmak üzere hemen `parse_workers` süreçlik havuza
+        verilir (None: çekirdek sayısı); ağ tarafı ayrıştırmayı beklemeden devam eder.
+        checkpoint verilirse her program ayrıştırılır ayrıştırılmaz kaydedilir.
+        """
+        print(f"\n⚡ Eşzamanlı mod: {concurrency} istek")
+        urls = [self.program_url(program['kod']) for program in programs]
+        loop = asyncio.get_running_loop()
+        parse_jobs = {}
+        fail_count = 0
+        fetched = 0
+
+        async def finish(program, url, parse_job):
+            try:
+                parsed = await parse_job
+            except Exception as e:
+                print(f"\n  ✗ Hata ({program['kod']}): {e}")
+                discard_cached(url)
+                return None
 
-                for cell in column:
-                    try:
-                        cell_length = len(str(cell.value))
-                        if cell_length > max_length:
-                            max_length = cell_length
-                    except:
-                        pass
+            print(f"\n'{program['program_adi']}' (Kod: {program['kod']})", end="")
+            df = self.build_program_frame(parsed, program['kod'], program['program_adi'])
+            if df is None:
+                # Tablosuz/boş sayfa önbellekte kalmasın
+                discard_cached(url)
+            if df is not None and checkpoint is not None:
+                checkpoint.save(program['kod'], program['program_adi'], df)
+            return df
 
-                adjusted_width = min(max(max_length + 2, 10), 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+        with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+            async for index, status, content, error in fetch_all(urls, concurrency, dict(self.session.headers)):
+                fetched += 1
+                program = programs[index]
+                print(f"\r[{fetched}/{len(programs)}] indirildi: '{program['program_adi']}'", end="", flush=True)
+
+                if error is not None or status != 200:
+                    print(f"\n  ✗ Hata ({program['kod']}): {error or f'HTTP {status}'}")
+                    fail_count += 1
+                    continue
+
+                parse_job = loop.run_in_executor(pool, parse_netler_table, content)
+                parse_jobs[index] = asyncio.ensure_future(finish(program, urls[index], parse_job))
+
+            # Çıktı sırası sıralı moddakiyle aynı kalsın
+            all_data = []
+            for index in sorted(parse_jobs):
+                df = await parse_jobs[index]
+                if df is not None:
+                    all_data.append(df)
+                else:
+                    fail_count += 1
+
+        return all_data, len(all_data), fail_count
+
+    def changed_rows(self, df, old_df):
+        """Önceki kayda göre yeni ya da değişmiş satırları döndürür"""
+        if old_df is None:
+            return df.assign(**{'Değişiklik': 'yeni'})
+        if list(df.columns) != list(old_df.columns):
+            return df.assign(**{'Değişiklik': 'değişti'})
+
+        merged = df.merge(old_df.drop_duplicates(), how='left', indicator=True)
+        changed = merged[merged['_merge'] == 'left_only'].drop(columns='_merge')
+        return changed.assign(**{'Değişiklik': 'değişti'})
+
+    async def scrape_changed_async(self, programs, concurrency, parse_workers, snapshot):
+        """Yalnızca `table#mydata` bloğu değişen programları ayrıştırıp snapshot'a yazar
+
+        Sayfalar önbellekte olsa da koşullu istekle yeniden doğrulanır (ttl=0). Özeti
+        snapshot'takiyle aynı olan programlar ayrıştırılmadan atlanır.
+        Dönüş: (delta DataFrame listesi, değişen, değişmeyen, başarısız)
+        """
+        print(f"\n⚡ Artımlı mod: {concurrency} istek")
+        known = snapshot.digests()
+        urls = [self.program_url(program['kod']) for program in programs]
+        loop = asyncio.get_running_loop()
+        parse_jobs = {}
+        unchanged_count = 0
+        fail_count = 0
+        fetched = 0
+
+        async def finish(program, url, digest, parse_job):
+            try:
+                parsed = await parse_job
+            except Exception as e:
+                print(f"\n  ✗ Hata ({program['kod']}): {e}")
+                discard_cached(url)
+                return None
 
-            # Hücreleri ortala
-            for row in worksheet.iter_rows(min_row=2):
-                for cell in row:
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
+            print(f"\n'{program['program_adi']}' (Kod: {program['kod']}) değişti", end="")
+            df = self.build_program_frame(parsed, program['kod'], program['program_adi'])
+            if df is None:
+                discard_cached(url)
+                return None
+            previous = snapshot.load([program['kod']])
+            delta = self.changed_rows(df, previous[0] if previous else None)
+            snapshot.save(program['kod'], program['program_adi'], df, digest)
+            return delta
+
+        with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+            async for index, status, content, error in fetch_all(urls, concurrency, dict(self.session.headers), ttl=0):
+                fetched += 1
+                program = programs[index]
+                print(f"\r[{fetched}/{len(programs)}] indirildi: '{program['program_adi']}'", end="", flush=True)
+
+                if error is not None or status != 200:
+                    print(f"\n  ✗ Hata ({program['kod']}): {error or f'HTTP {status}'}")
+                    fail_count += 1
+                    continue
+
+                digest = mydata_digest(content)
+                if digest is not None and known.get(program['kod']) == digest:
+                    unchanged_count += 1
+                    continue
+
+                parse_job = loop.run_in_executor(pool, parse_netler_table, content)
+                parse_jobs[index] = asyncio.ensure_future(finish(program, urls[index], digest, parse_job))
+
+            delta = []
+            for index in sorted(parse_jobs):
+                df = await parse_jobs[index]
+                if df is not None:
+                    delta.append(df)
+                else:
+                    fail_count += 1
+
+        return delta, len(delta), unchanged_count, fail_count
+
+    def scrape_incremental(self, programs, concurrency, parse_workers, snapshot_path):
+        """Artımlı çalıştırma: değişen programları günceller, delta ve birleşik snapshot döndürür
+
+        Snapshot deposu çalıştırmalar arasında silinmez; her programın son tablosunu ve
+        sayfa özetini tutar. Çekilemeyen programların önceki kaydı snapshot'ta kalır.
+        """
+        snapshot = CheckpointStore(snapshot_path)
+        try:
+            delta, changed_count, unchanged_count, fail_count = run_sync(
+                self.scrape_changed_async(programs, concurrency, parse_workers, snapshot))
+            print(f"\n\n↻ {changed_count} program değişti, {unchanged_count} program aynı kaldı")
+
+            all_data = [normalize_frame(df, LISANS_SCHEMA)
+                        for df in snapshot.load([program['kod'] for program in programs])]
+            return all_data, delta, fail_count
+        finally:
+            snapshot.close()
+
+    def scrape_with_checkpoint(self, programs, concurrency, parse_workers, resume, checkpoint_path):
+        """Programları checkpoint deposu üzerinden çeker, parçaları program sırasıyla birleştirir
+
+        resume=True ise önceki çalıştırmada tamamlanan programlar yeniden çekilmez.
+        """
+        checkpoint = CheckpointStore(checkpoint_path)
+        try:
+            if resume:
+                completed = checkpoint.completed()
+                remaining = [program for program in programs if program['kod'] not in completed]
+                print(f"\n↻ Devam modu: {len(programs) - len(remaining)} program önceki çalıştırmadan alınacak")
+            else:
+                checkpoint.clear()
+                remaining = programs
 
-    def run(self, limit=None):
-        """Ana fonksiyon"""
+            if concurrency:
+                _, _, fail_count = run_sync(
+                    self.scrape_programs_async(remaining, concurrency, parse_workers, checkpoint))
+            else:
+                _, _, fail_count = self.scrape_programs(remaining, checkpoint)
+
+            # Parçaları birleştir
+            # Eski sürümün metin halindeki parçaları da tiplenir (tiplenmiş sütunlara dokunulmaz)
+            all_data = [normalize_frame(df, LISANS_SCHEMA)
+                        for df in checkpoint.load([program['kod'] for program in programs])]
+            return all_data, len(all_data), fail_count
+        finally:
+            checkpoint.close()
+
+    def run(self, limit=None, concurrency=None, parse_workers=None, resume=False, incremental=False):
+        """Ana fonksiyon
+
+        concurrency verilirse sayfalar tek bir havuzlu istemciyle eşzamanlı çekilir ve
+        parse_workers süreçlik havuzda ayrıştırılır. Her programın satırları anında
+        checkpoint'e yazılır; resume=True yarıda kalan çalıştırmaya kaldığı yerden devam eder.
+
+        incremental=True ise yalnızca tablosu değişen programlar ayrıştırılır; yeni ya da
+        değişen satırlar ayrı bir delta dosyasına, birleşik tablo her zamanki dosyalara yazılır.
+        """
         print("="*60)
         print("YÖK ATLAS NET VERİLERİ ÇEKME - LISANS")
         print("="*60)
@@ -248,24 +402,14 @@ class YokAtlasNetScraper:
             programs = programs[:limit]
             print(f"\n⚠️  İlk {limit} program işlenecek (test modu)")
 
-        all_data = []
-        success_count = 0
-        fail_count = 0
-
-        # Her program için veri çek
-        for i, program in enumerate(programs, 1):
-            print(f"\n[{i}/{len(programs)}] ", end="")
-            df = self.scrape_program_data(program['kod'], program['program_adi'])
-
-            if df is not None:
-                all_data.append(df)
-                success_count += 1
-            else:
-                fail_count += 1
-
-            # Bekle
-            if i < len(programs):
-                time.sleep(0.5)
+        delta = None
+        if incremental:
+            all_data, delta, fail_count = self.scrape_incremental(
+                programs, concurrency or 1, parse_workers, '.cache/yokatlas_netler.snapshot.sqlite')
+            success_count = len(all_data)
+        else:
+            all_data, success_count, fail_count = self.scrape_with_checkpoint(
+                programs, concurrency, parse_workers, resume, '.cache/yokatlas_netler.checkpoint.sqlite')
 
         # Verileri kaydet
         if all_data:
@@ -273,7 +417,11 @@ class YokAtlasNetScraper:
             print("KAYIT İŞLEMİ")
             print("="*60)
 
+            if delta is not None:
+                self.save_delta(delta)
+
             combined_df = self.save_to_csv(all_data)
+            self.save_to_parquet(all_data)
 
             if combined_df is not None:
                 self.save_to_excel(combined_df)
@@ -286,6 +434,9 @@ class YokAtlasNetScraper:
         else:
             print("\n❌ Hiç veri çekilemedi!")
 
+        # YOKATLAS_METRICS verilmişse istek/ayrıştırma/yazma ölçümleri dosyaya yazılır
+        export_metrics()
+
 # ÇALIŞTIR
 if __name__ == "__main__":
     scraper = YokAtlasNetScraper()
@@ -294,3 +445,7 @@ if __name__ == "__main__":
     #scraper.run(limit=5)
     scraper.run()
     # Tümü için: scraper.run()
+    # Eşzamanlı (hızlı) mod: scraper.run(concurrency=16)
+    # Yarıda kalan çalıştırmaya devam: scraper.run(resume=True)
+    # Günlük yenileme (yalnızca değişen programlar): scraper.run(concurrency=16, incremental=True)
+    # Ölçümler (Prometheus / JSON): YOKATLAS_METRICS=metrics.prom python yokatlas-lisans-netler.py
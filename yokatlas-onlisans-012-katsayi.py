@@ -1,12 +1,18 @@
 !pip install requests beautifulsoup4 lxml tqdm
 
-import requests
 from bs4 import BeautifulSoup
-import csv
+import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
+from yokatlas_common import BASE_URL
+from yokatlas_common.cache import DEFAULT_TTL, cached_get, discard_cached
+from yokatlas_common.client import create_session
+from yokatlas_common.metrics import export_metrics
+from yokatlas_common.sinks import LongFormatSink
+
 headers = {"User-Agent": "Mozilla/5.0"}
 
 years = {
@@ -16,8 +22,12 @@ years = {
     "2022": "2022/"
 }
 
-base_main = "https://yokatlas.yok.gov.tr/onlisans-anasayfa.php"
-base_program = "https://yokatlas.yok.gov.tr/onlisans-program.php?b="
+# y kodu toplama 8, yıl taraması yıl başına bir işçi; hepsi tek bağlantı havuzunu paylaşır
+Y_CODE_WORKERS = 8
+session = create_session(pool_size=max(Y_CODE_WORKERS, len(years)))
+
+base_main = f"{BASE_URL}/onlisans-anasayfa.php"
+base_program = f"{BASE_URL}/onlisans-program.php?b="
 
 def clean(text):
     return text.replace("\n","").replace("\xa0"," ").strip()
@@ -25,7 +35,7 @@ def clean(text):
 # ----------------------------------------------------
 # Program ID'leri al
 # ----------------------------------------------------
-resp = requests.get(base_main, headers=headers)
+resp = cached_get(session.get, base_main, headers=headers)
 soup = BeautifulSoup(resp.text, "lxml")
 
 program_ids = []
@@ -39,61 +49,97 @@ print("Toplam Program:", len(program_ids))
 
 
 # ----------------------------------------------------
-# YIL DÖNGÜSÜ
+# Program -> y kodları (tek sefer)
 # ----------------------------------------------------
-for year, prefix in years.items():
-
-    print("\n==========================")
-    print("İşlenen Yıl:", year)
-    print("==========================")
-
-    csv_file = f"yokatlas_onlisans_{year}.csv"
-    processed_file = f"processed_{year}.txt"
-
-    processed_y = set()
-    if os.path.exists(processed_file):
-        with open(processed_file, "r") as f:
-            for line in f:
-                processed_y.add(line.strip())
+# onlisans-program.php sayfası yıldan bağımsız; y kodları bir kez çıkarılıp
+# zaman damgasıyla diske yazılır. Y_CODES_MAX_AGE'den eski kayıtlar ya da
+# YOKATLAS_REFRESH_Y_CODES=1 ile tümü yeniden çıkarılır; çekilemeyen programın
+# varsa eski kaydı korunur, boş sonuç hiç yazılmaz.
+y_codes_file = "onlisans_y_codes.json"
+Y_CODES_MAX_AGE = DEFAULT_TTL  # saniye
+REFRESH_Y_CODES = os.environ.get("YOKATLAS_REFRESH_Y_CODES") == "1"
+
+def get_y_codes(program_id):
+    url = base_program + program_id
+    r = cached_get(session.get, url, headers=headers, timeout=10, ttl=0 if REFRESH_Y_CODES else None)
+    r.raise_for_status()
+    s = BeautifulSoup(r.text, "lxml")
+
+    y_codes = []
+    for a in s.find_all("a", href=True):
+        if "onlisans.php?y=" in a["href"]:
+            y = a["href"].split("y=")[1]
+            y_codes.append(y)
+
+    if not y_codes:
+        # Boş/hata sayfası önbellekte kalmasın; sonraki çalıştırmada yeniden denenir
+        discard_cached(url)
+    return list(set(y_codes))
+
+def is_fresh(entry):
+    # Eski biçimdeki (zaman damgasız liste) kayıtlar da yenilenir
+    return (not REFRESH_Y_CODES and isinstance(entry, dict)
+            and time.time() - entry.get("saved_at", 0) < Y_CODES_MAX_AGE)
+
+program_y_codes = {}  # program_id -> {"y_codes": [...], "saved_at": ...}
+if os.path.exists(y_codes_file):
+    with open(y_codes_file, "r", encoding="utf-8") as f:
+        program_y_codes = {pid: entry if isinstance(entry, dict) else {"y_codes": entry, "saved_at": 0}
+                           for pid, entry in json.load(f).items()}
+
+missing_ids = [pid for pid in program_ids if not is_fresh(program_y_codes.get(pid))]
+if missing_ids:
+    with ThreadPoolExecutor(max_workers=Y_CODE_WORKERS) as executor:
+        futures = {executor.submit(get_y_codes, pid): pid for pid in missing_ids}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="y kodları"):
+            try:
+                y_codes = future.result()
+            except:
+                continue
+            if y_codes:
+                program_y_codes[futures[future]] = {"y_codes": y_codes, "saved_at": time.time()}
+
+    with open(y_codes_file, "w", encoding="utf-8") as f:
+        json.dump(program_y_codes, f)
+
+print("Toplam y kodu:", sum(len(program_y_codes[pid]["y_codes"]) for pid in program_ids if pid in program_y_codes))
 
-    header_written = os.path.exists(csv_file)
 
-    base_dynamic = f"https://yokatlas.yok.gov.tr/{prefix}content/onlisans-dynamic/3000_1.php?y="
+# ----------------------------------------------------
+# YIL DÖNGÜSÜ (yıllar eşzamanlı)
+# ----------------------------------------------------
+def scrape_year(position, year, prefix):
 
-    for program_id in tqdm(program_ids):
+    csv_file = f"yokatlas_onlisans_{year}.csv"
+    long_file = f"yokatlas_onlisans_{year}.long.csv"
+    processed_file = f"processed_{year}.long.txt"
 
-        try:
-            program_url = base_program + program_id
-            r = requests.get(program_url, headers=headers, timeout=10)
-            s = BeautifulSoup(r.text, "lxml")
+    # Sayfalardaki anahtarlar değişken; satırlar (Yıl, Program_ID, Y_Code, key, value)
+    # olarak yazılır, geniş CSV yıl sonunda tek seferde kurulur
+    sink = LongFormatSink(long_file, ["Yıl", "Program_ID", "Y_Code"],
+                          encoding="utf-8-sig", checkpoint_path=processed_file)
+    processed_y = sink.processed
 
-            y_codes = []
-            for a in s.find_all("a", href=True):
-                if "onlisans.php?y=" in a["href"]:
-                    y = a["href"].split("y=")[1]
-                    y_codes.append(y)
+    base_dynamic = f"{BASE_URL}/{prefix}content/onlisans-dynamic/3000_1.php?y="
 
-            y_codes = list(set(y_codes))
+    try:
+        for program_id in tqdm(program_ids, desc=year, position=position):
 
-            for y in y_codes:
+            for y in program_y_codes.get(program_id, {}).get("y_codes", []):
 
                 if y in processed_y:
                     continue
 
                 try:
                     dynamic_url = base_dynamic + y
-                    d = requests.get(dynamic_url, headers=headers, timeout=10)
+                    d = cached_get(session.get, dynamic_url, headers=headers, timeout=10)
 
                     if d.status_code != 200:
                         continue
 
                     dsoup = BeautifulSoup(d.text, "lxml")
 
-                    row_data = {
-                        "Yıl": year,
-                        "Program_ID": program_id,
-                        "Y_Code": y
-                    }
+                    row_data = {}
 
                     # ✅ Program Adı
                     big_tag = dsoup.find("big")
@@ -108,31 +154,24 @@ for year, prefix in years.items():
                             value = clean(cols[1].get_text())
                             row_data[key] = value
 
-                    # HEADER
-                    if not header_written:
-                        with open(csv_file, "w", newline="", encoding="utf-8-sig") as f:
-                            writer = csv.DictWriter(f, fieldnames=row_data.keys())
-                            writer.writeheader()
-                        header_written = True
-
-                    # APPEND
-                    with open(csv_file, "a", newline="", encoding="utf-8-sig") as f:
-                        writer = csv.DictWriter(f, fieldnames=row_data.keys())
-                        writer.writerow(row_data)
-
-                    with open(processed_file, "a") as f:
-                        f.write(y + "\n")
-
-                    processed_y.add(y)
-
-                    print(f"{year} Kaydedildi:", y)
-
-                    time.sleep(0.3)
+                    sink.write_record((year, program_id, y), row_data, key=y)
 
                 except:
                     continue
+    finally:
+        sink.close()
+
+    sink.to_wide(csv_file)
+
+    return year
 
-        except:
-            continue
+with ThreadPoolExecutor(max_workers=len(years)) as executor:
+    futures = [
+        executor.submit(scrape_year, position, year, prefix)
+        for position, (year, prefix) in enumerate(years.items())
+    ]
+    for future in as_completed(futures):
+        print(f"\n{future.result()} tamamlandı")
 
 print("\nTÜM YILLAR TAMAMLANDI 🚀")
+export_metrics()
@@ -0,0 +1,6 @@
+"""YÖK Atlas kazıyıcılarının ortak yardımcıları."""
+
+import os
+
+# YOKATLAS_BASE_URL ile yerel bir sunucuya (ör. bench/standin_server.py) yönlendirilebilir
+BASE_URL = os.environ.get('YOKATLAS_BASE_URL', 'https://yokatlas.yok.gov.tr').rstrip('/')
@@ -0,0 +1,82 @@
+"""Eşzamanlı (asyncio) sayfa indirme yardımcıları."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from yokatlas_common.cache import get_cache
+from yokatlas_common.client import async_client
+from yokatlas_common.metrics import METRICS
+from yokatlas_common.ratelimit import LIMITER, polite_get_async
+
+
+def run_sync(coro):
+    """Coroutine'i çalıştırır; açık bir event loop varsa (Jupyter/Colab) ayrı thread'de çalıştırır."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+async def fetch_all(urls, concurrency=8, headers=None, timeout=10, limiter=None, cache=None, ttl=None):
+    """URL'leri tek bir havuzlu istemciyle, en fazla `concurrency` istek uçuşta olacak şekilde indirir.
+
+    İstekler önce yanıt önbelleğine bakar, sonra ortak hız sınırlayıcıdan geçer;
+    429/5xx yanıtları polite_get'teki gibi sınırlayıcı beklenerek yeniden denenir.
+    ttl=0 verilirse önbellekteki her kayıt koşullu istekle yeniden doğrulanır.
+    Sonuçlar geliş sırasına göre (index, status_code, content, error) olarak döner.
+    """
+    limiter = limiter or LIMITER
+    cache = cache or get_cache()
+    if cache is not None and ttl is None:
+        ttl = cache.ttl
+
+    pending = asyncio.Queue()
+    done = asyncio.Queue()
+    for item in enumerate(urls):
+        pending.put_nowait(item)
+
+    async def fetch_one(client, url):
+        """(status_code, content, error); ağ hatası error olarak döner"""
+        entry = cache.lookup(url) if cache else None
+        if entry is not None and entry.is_fresh(ttl):
+            METRICS.cache_hit(url)
+            return entry.status_code, entry.content, None
+
+        try:
+            response = await polite_get_async(client.get, url, limiter,
+                                              headers=entry.conditional_headers() if entry else None)
+        except Exception as e:
+            return None, None, e
+
+        if response.status_code == 304 and entry is not None:
+            cache.touch(url)
+            return entry.status_code, entry.content, None
+        if response.status_code == 200 and cache:
+            cache.store(url, 200, response.headers, response.content)
+        return response.status_code, response.content, None
+
+    async def worker(client):
+        while True:
+            try:
+                index, url = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            # Önbellek dahil her hata sonuca yazılır; tüketici done.get()'te asılı kalmaz
+            try:
+                status_code, content, error = await fetch_one(client, url)
+            except Exception as e:
+                status_code, content, error = None, None, e
+            await done.put((index, status_code, content, error))
+
+    async with async_client(concurrency, headers, timeout) as client:
+        workers = [asyncio.create_task(worker(client)) for _ in range(max(1, concurrency))]
+        try:
+            for _ in range(len(urls)):
+                yield await done.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
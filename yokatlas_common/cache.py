@@ -0,0 +1,168 @@
+"""URL anahtarlı, içerik adresli (SHA-256) SQLite yanıt önbelleği.
+
+Önbellekteki kayıt `ttl` saniyeden yeniyse ağa çıkılmaz. Eskiyse ve sunucu
+ETag/Last-Modified göndermişse koşullu istek yapılır; 304 gelirse kayıt
+tazelenip önbellekteki içerik döner. YOKATLAS_CACHE=0 ile kapatılabilir,
+YOKATLAS_CACHE_TTL ile tazelik süresi (saniye) değiştirilebilir.
+
+Yanıt 200 döner dönmez saklanır; sayfayı ayrıştıramayan çağıran
+discard_cached() ile kaydı siler, böylece tekrar deneme ağa çıkar ve boş ya da
+hata şablonu önbellekte kalmaz.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from yokatlas_common.metrics import METRICS
+from yokatlas_common.ratelimit import polite_get
+
+CACHE_PATH = os.path.join('.cache', 'responses.sqlite')
+DEFAULT_TTL = 7 * 24 * 60 * 60  # saniye; sayfalar en fazla yerleştirme döneminde değişiyor
+
+# Önbellekte saklanan yanıt başlıkları
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+CHARSET_RE = re.compile(r'charset=([\w-]+)', re.I)
+
+
+class CachedResponse:
+    """Önbellekten dönen yanıt; requests.Response'un kullanılan kısmıyla uyumlu"""
+
+    def __init__(self, url, status_code, content, headers, fetched_at):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.fetched_at = fetched_at
+        self.from_cache = True
+
+    @property
+    def encoding(self):
+        match = CHARSET_RE.search(self.headers.get('Content-Type', ''))
+        return match.group(1) if match else 'utf-8'
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+    def raise_for_status(self):
+        pass
+
+    def is_fresh(self, ttl):
+        return time.time() - self.fetched_at < ttl
+
+    def conditional_headers(self):
+        headers = {}
+        if self.headers.get('ETag'):
+            headers['If-None-Match'] = self.headers['ETag']
+        if self.headers.get('Last-Modified'):
+            headers['If-Modified-Since'] = self.headers['Last-Modified']
+        return headers
+
+
+class ResponseCache:
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'url TEXT PRIMARY KEY, digest TEXT, status INTEGER, headers TEXT, fetched_at REAL)'
+            )
+            self.conn.execute('CREATE TABLE IF NOT EXISTS bodies (digest TEXT PRIMARY KEY, content BLOB)')
+
+    def lookup(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT r.status, r.headers, r.fetched_at, b.content FROM responses r '
+                'JOIN bodies b ON b.digest = r.digest WHERE r.url = ?', (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, headers, fetched_at, content = row
+        return CachedResponse(url, status, bytes(content), json.loads(headers), fetched_at)
+
+    def store(self, url, status_code, headers, content):
+        kept = {name: headers[name] for name in KEPT_HEADERS if headers.get(name)}
+        digest = hashlib.sha256(content).hexdigest()
+        fetched_at = time.time()
+        with self.lock, self.conn:
+            self.conn.execute('INSERT OR IGNORE INTO bodies VALUES (?, ?)', (digest, content))
+            self.conn.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                              (url, digest, status_code, json.dumps(kept), fetched_at))
+        return CachedResponse(url, status_code, content, kept, fetched_at)
+
+    def discard(self, url):
+        """Kaydı siler; başka URL'nin kullanmadığı gövde de silinir"""
+        with self.lock, self.conn:
+            row = self.conn.execute('SELECT digest FROM responses WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                return
+            self.conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            self.conn.execute('DELETE FROM bodies WHERE digest = ? AND NOT EXISTS '
+                              '(SELECT 1 FROM responses WHERE digest = ?)', (row[0], row[0]))
+
+    def touch(self, url):
+        """304 sonrası kaydın tazelik süresini yeniler"""
+        with self.lock, self.conn:
+            self.conn.execute('UPDATE responses SET fetched_at = ? WHERE url = ?', (time.time(), url))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Paylaşılan önbelleği döndürür (ilk kullanımda açılır); kapalıysa None"""
+    global _cache
+    if os.environ.get('YOKATLAS_CACHE', '1') == '0':
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(ttl=float(os.environ.get('YOKATLAS_CACHE_TTL', DEFAULT_TTL)))
+        return _cache
+
+
+def discard_cached(url, cache=None):
+    """Ayrıştırılamayan sayfanın kaydını siler; sonraki istek yeniden indirir"""
+    cache = cache or get_cache()
+    if cache is not None:
+        cache.discard(url)
+
+
+def cached_get(get, url, cache=None, ttl=None, **kwargs):
+    """polite_get'in önbellekli hali: taze kayıt varsa ağa çıkmaz, eskiyse koşullu istek atar"""
+    cache = cache or get_cache()
+    if cache is None:
+        return polite_get(get, url, **kwargs)
+    ttl = cache.ttl if ttl is None else ttl
+
+    entry = cache.lookup(url)
+    if entry is not None:
+        if entry.is_fresh(ttl):
+            METRICS.cache_hit(url)
+            return entry
+        kwargs['headers'] = {**(kwargs.get('headers') or {}), **entry.conditional_headers()}
+
+    response = polite_get(get, url, **kwargs)
+
+    if response.status_code == 304 and entry is not None:
+        cache.touch(url)
+        return entry
+    if response.status_code == 200:
+        cache.store(url, 200, response.headers, response.content)
+    return response
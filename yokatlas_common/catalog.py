@@ -0,0 +1,68 @@
+"""netler.php program kataloğu: tek indirme, tek ayrıştırma, disk önbelleği."""
+
+import json
+import os
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from yokatlas_common import BASE_URL
+from yokatlas_common.client import get_session
+from yokatlas_common.ratelimit import polite_get
+
+CACHE_PATH = os.path.join('.cache', 'netler_catalog.json')
+DEFAULT_TTL = 24 * 60 * 60  # saniye
+
+# <select> id'si -> katalog anahtarı
+SELECT_IDS = {'bolum': 'lisans', 'program': 'onlisans'}
+
+
+def parse_netler_catalog(content):
+    """netler.php içindeki lisans (bolum) ve önlisans (program) listelerini tek geçişte çıkarır"""
+    strainer = SoupStrainer('select', attrs={'id': list(SELECT_IDS)})
+    soup = BeautifulSoup(content, 'html.parser', parse_only=strainer)
+
+    catalog = {key: [] for key in SELECT_IDS.values()}
+    for select_element in soup.find_all('select'):
+        programs = catalog[SELECT_IDS[select_element.get('id')]]
+        for option in select_element.find_all('option'):
+            value = option.get('value')
+            if value:
+                programs.append({
+                    'kod': value,
+                    'program_adi': option.text.strip()
+                })
+    return catalog
+
+
+def load_netler_catalog(get=None, base_url=BASE_URL, ttl=DEFAULT_TTL,
+                        cache_path=CACHE_PATH, **kwargs):
+    """Kataloğu döndürür; önbellek `ttl` saniyeden yeniyse ağa hiç çıkmaz
+
+    kwargs doğrudan `get` çağrısına iletilir (headers, verify vb.); get verilmezse
+    ortak oturum (client.get_session) kullanılır.
+    """
+    url = f"{base_url}/netler.php"
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('url') == url and time.time() - cached.get('fetched_at', 0) < ttl:
+                return cached['catalog']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    kwargs.setdefault('timeout', 10)
+    response = polite_get(get or get_session().get, url, **kwargs)
+    response.raise_for_status()
+    catalog = parse_netler_catalog(response.content)
+
+    if cache_path and any(catalog.values()):
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'fetched_at': time.time(), 'catalog': catalog}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+
+    return catalog
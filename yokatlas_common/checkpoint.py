@@ -0,0 +1,69 @@
+"""Program bazında kontrol noktası (checkpoint) deposu.
+
+Her programın DataFrame'i biter bitmez SQLite'a yazılır; çalışma yarıda kalırsa
+resume modunda tamamlanan program kodları atlanır ve parçalar sonda birleştirilir.
+Kayıtla birlikte sayfa özeti (digest) de saklanabilir; artımlı mod değişmeyen
+programları bu özetle tanır.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+
+class CheckpointStore:
+    def __init__(self, path):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS parts ('
+                'program_code TEXT PRIMARY KEY, program_name TEXT, frame BLOB, saved_at REAL, digest TEXT)'
+            )
+            columns = {row[1] for row in self.conn.execute('PRAGMA table_info(parts)')}
+            if 'digest' not in columns:
+                self.conn.execute('ALTER TABLE parts ADD COLUMN digest TEXT')
+
+    def completed(self):
+        """Kaydı bulunan program kodlarını döndürür"""
+        with self.lock:
+            return {row[0] for row in self.conn.execute('SELECT program_code FROM parts')}
+
+    def digests(self):
+        """Program kodu -> kayıtlı sayfa özeti"""
+        with self.lock:
+            return {row[0]: row[1] for row in
+                    self.conn.execute('SELECT program_code, digest FROM parts WHERE digest IS NOT NULL')}
+
+    def save(self, program_code, program_name, df, digest=None):
+        frame = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO parts (program_code, program_name, frame, saved_at, digest) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (str(program_code), program_name, frame, time.time(), digest))
+
+    def load(self, program_codes):
+        """Verilen sıradaki programların kayıtlı DataFrame'lerini döndürür (kaydı olmayanlar atlanır)"""
+        frames = []
+        with self.lock:
+            for program_code in program_codes:
+                row = self.conn.execute('SELECT frame FROM parts WHERE program_code = ?',
+                                        (str(program_code),)).fetchone()
+                if row is not None:
+                    frames.append(pickle.loads(row[0]))
+        return frames
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute('DELETE FROM parts')
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
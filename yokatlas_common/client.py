@@ -0,0 +1,84 @@
+"""Kazıyıcıların paylaştığı, bağlantı havuzlu HTTP istemcileri.
+
+create_session() / get_session(): requests.Session
+    - keep-alive havuzu işçi sayısına göre (pool_size)
+    - varsayılan zaman aşımı (çağrıda timeout verilmezse)
+    - yalnızca bağlantı kurulamadığında üstel beklemeli tekrar deneme
+    - gzip/deflate; brotli paketi yüklüyse br
+
+429/5xx burada tekrar denenmez: yanıt polite_get'e döner, hız sınırlayıcı
+(ratelimit.LIMITER) durumu görüp yavaşlar ve tekrar deneme oradan yapılır.
+
+async_client(): httpx.AsyncClient; aynı ayarlar, h2 paketi yüklüyse HTTP/2.
+"""
+
+import importlib.util
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_TIMEOUT = 15  # saniye
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36'
+}
+
+RETRY = Retry(
+    total=3, connect=3, read=0, status=0,
+    backoff_factor=0.5,
+    allowed_methods=('GET', 'HEAD'),
+)
+
+HTTP2 = importlib.util.find_spec('h2') is not None
+
+
+class PooledSession(requests.Session):
+    """Çağrıda timeout verilmezse varsayılanı kullanan Session"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_session(pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT, headers=None, retry=RETRY):
+    """Havuzu `pool_size` bağlantı olan yeni bir Session (thread'ler arasında paylaşılabilir)"""
+    session = PooledSession(timeout)
+    session.headers.update(DEFAULT_HEADERS)
+    # brotli/brotlicffi yüklüyse 'br' de eklenir
+    session.headers['Accept-Encoding'] = make_headers(accept_encoding=True)['accept-encoding']
+    if headers:
+        session.headers.update(headers)
+
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry, pool_block=False)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Tüm modüllerin paylaştığı varsayılan Session (ilk kullanımda açılır)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def async_client(concurrency=8, headers=None, timeout=DEFAULT_TIMEOUT):
+    """En fazla `concurrency` bağlantılı httpx.AsyncClient; h2 yüklüyse HTTP/2"""
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    transport = httpx.AsyncHTTPTransport(retries=RETRY.connect, http2=HTTP2, limits=limits)
+    return httpx.AsyncClient(headers={**DEFAULT_HEADERS, **(headers or {})}, timeout=timeout,
+                             transport=transport, http2=HTTP2, follow_redirects=True)
@@ -0,0 +1,246 @@
+"""Parquet (Arrow) çıktısı.
+
+Tablolar hive düzeninde `program_turu=/puan_turu=/yil=` klasörlerine bölünerek
+yazılır. Türkçe biçimli sayı sütunları (ondalık virgül, binlik nokta, '---',
+'Dolmadı') sayıya, üniversite ve program adları sözlük kodlu (dictionary)
+sütunlara çevrilir; böylece dosyalar küçülür ve okuma CSV'ye göre çok hızlanır.
+
+ParquetSink parça parça yazdığı için sütun tipleri parçadaki verilere göre
+seçilmez: başlıklar ve normalize şemasından bir kez kurulan sabit Arrow şeması
+her parçaya uygulanır, şemadaki sütunlarda sayıya çevrilemeyen değer null olur.
+Böylece bölümdeki tüm parçalar tek şemayla okunabilir.
+"""
+
+import os
+import shutil
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from yokatlas_common.metrics import METRICS
+from yokatlas_common.normalize import column_dtype, is_missing, normalize_frame, parse_turkish_number
+
+PARQUET_ROOT = 'parquet'
+
+YEAR_COLUMNS = ('Yılı', 'Yıl')
+PUAN_TURU_COLUMNS = ('Puan Türü', 'Puan Turu')
+
+# Sayı gibi görünse de metin kalması gereken sütunlar
+TEXT_COLUMNS = ('Program Kodu', 'Üniversite Kodu', 'Program_ID', 'Y_Code')
+
+# Sütun adında bu sınavlar geçiyorsa tablo o puan türündendir (ilk eşleşme geçerli)
+PUAN_TURU_MARKERS = (
+    ('DİL', 'YDT'),
+    ('SÖZ', 'AYT TDE'),
+    ('SÖZ', 'AYT Din'),
+    ('EA', 'AYT Türk Dili'),
+    ('EA', 'AYT Tarih'),
+    ('SAY', 'AYT Fizik'),
+    ('SAY', 'AYT Kimya'),
+)
+
+
+def infer_puan_turu(columns):
+    """Sütun adlarından puan türünü çıkarır; AYT/YDT sütunu yoksa 'TYT'"""
+    for puan_turu, marker in PUAN_TURU_MARKERS:
+        if any(str(column).startswith(marker) for column in columns):
+            return puan_turu
+    return 'TYT'
+
+
+def to_arrow_frame(df, schema=None):
+    """Tamamı sayı olan metin sütunlarını float'a, kalan metin sütunlarını kategoriye çevirir
+
+    schema verilirse (normalize.LISANS_SCHEMA vb.) önce şemadaki sütunlar tiplenir.
+    """
+    if schema is not None:
+        df = normalize_frame(df, schema)
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        is_text = pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)
+        if is_text and column not in TEXT_COLUMNS:
+            numbers = parse_turkish_number(values)
+            if numbers.notna().sum() == (~is_missing(values)).sum():
+                values = numbers.astype('float64')
+            else:
+                values = values.astype('string').astype('category')
+        elif is_text:
+            values = values.astype('string')
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+# Şema tipi -> Arrow tipi; şemada olmayan metin sütunları sözlük kodlu yazılır
+ARROW_TYPES = {'Int32': pa.int32(), 'float64': pa.float64()}
+DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+
+
+def sink_schema(headers, schema=None):
+    """Başlıklardan parçaların ortak Arrow şemasını kurar (bölüm sütunları hariç)"""
+    fields = []
+    for header in headers:
+        if header in TEXT_COLUMNS:
+            arrow_type = pa.string()
+        else:
+            dtype = column_dtype(header, schema) if schema is not None else None
+            arrow_type = ARROW_TYPES.get(dtype, DICTIONARY)
+        fields.append(pa.field(header, arrow_type))
+    return pa.schema(fields)
+
+
+def conform_frame(df, arrow_schema):
+    """DataFrame'i verilen şemaya uydurur; sayı sütununda çevrilemeyen değer null olur"""
+    columns = {}
+    for field in arrow_schema:
+        values = df[field.name]
+        if pa.types.is_integer(field.type):
+            numbers = parse_turkish_number(values, thousands=True)
+            values = numbers.where(numbers % 1 == 0).astype('Int32')
+        elif pa.types.is_floating(field.type):
+            values = parse_turkish_number(values).astype('float64')
+        elif pa.types.is_dictionary(field.type):
+            values = values.astype('string').astype('category')
+        else:
+            values = values.astype('string')
+        columns[field.name] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _find_column(df, names):
+    return next((name for name in names if name in df.columns), None)
+
+
+def _arrow_table(frame):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    # Parçalar arasında şema aynı kalsın diye sözlük indeksleri int32'ye sabitlenir
+    fields = [
+        pa.field(field.name, pa.dictionary(pa.int32(), pa.string()))
+        if pa.types.is_dictionary(field.type) else field
+        for field in table.schema
+    ]
+    return table.cast(pa.schema(fields))
+
+
+def partition_dir(root, program_turu, puan_turu=None):
+    path = os.path.join(root, f'program_turu={program_turu}')
+    if puan_turu is not None:
+        path = os.path.join(path, f'puan_turu={puan_turu}')
+    return path
+
+
+def write_parquet(df, program_turu, puan_turu=None, root=PARQUET_ROOT, replace=True, schema=None,
+                  arrow_schema=None):
+    """DataFrame'i program_turu / puan_turu / yil bölümlerine Parquet olarak yazar
+
+    puan_turu verilmezse 'Puan Türü' sütunundan, o da yoksa sütun adlarından
+    çıkarılır. replace=True ise yazılan bölümlerdeki eski dosyalar silinir.
+    arrow_schema verilirse (sink_schema) sütun tipleri veriden çıkarılmaz, bu şemaya uydurulur.
+    """
+    if df is None or df.empty:
+        return
+
+    frame = to_arrow_frame(df, schema) if arrow_schema is None else conform_frame(df, arrow_schema)
+    frame['program_turu'] = program_turu
+
+    if puan_turu is not None:
+        frame['puan_turu'] = puan_turu
+    else:
+        column = _find_column(df, PUAN_TURU_COLUMNS)
+        if column is not None:
+            frame['puan_turu'] = df[column].astype('string').str.strip().fillna('')
+        else:
+            frame['puan_turu'] = infer_puan_turu(df.columns)
+
+    partition_cols = ['program_turu', 'puan_turu']
+    year_column = _find_column(df, YEAR_COLUMNS)
+    if year_column is not None:
+        frame['yil'] = parse_turkish_number(df[year_column], thousands=True).astype('Int32')
+        partition_cols.append('yil')
+
+    if arrow_schema is None:
+        table = _arrow_table(frame)
+    else:
+        partition_fields = [pa.field('yil', pa.int32()) if name == 'yil' else pa.field(name, pa.string())
+                            for name in partition_cols]
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.cast(pa.schema(list(arrow_schema) + partition_fields))
+
+    with METRICS.timer('yokatlas_write_seconds', sink='parquet'):
+        pq.write_to_dataset(
+            table, root,
+            partition_cols=partition_cols,
+            basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet',
+            existing_data_behavior='delete_matching' if replace else 'overwrite_or_ignore',
+        )
+    METRICS.inc('yokatlas_rows_written_total', len(frame), sink='parquet')
+
+
+class ParquetSink:
+    """TableSink ile aynı arayüzde Parquet hedefi
+
+    Satırlar bellekte birikir; `flush_rows` satırda ve close() sırasında bölüm
+    klasörlerine yeni bir parça olarak yazılır. append=False ise aynı program
+    türü / puan türü bölümü baştan oluşturulur. Tüm parçalar headers ve schema'dan
+    kurulan tek Arrow şemasıyla yazılır; append=True'da bölümdeki mevcut parçaların
+    şeması farklıysa ValueError verilir (karışık şemalı bölüm okunamaz).
+    """
+
+    def __init__(self, headers, program_turu, puan_turu=None, root=PARQUET_ROOT, append=False,
+                 flush_rows=200_000, schema=None):
+        self.headers = list(headers)
+        self.schema = schema
+        self.program_turu = program_turu
+        self.puan_turu = puan_turu
+        self.root = root
+        self.flush_rows = flush_rows
+        self.rows = []
+        self.closed = False
+        self.arrow_schema = sink_schema(self.headers, schema)
+
+        directory = partition_dir(root, program_turu, puan_turu)
+        if not append:
+            shutil.rmtree(directory, ignore_errors=True)
+        else:
+            self.check_existing(directory)
+
+    def check_existing(self, directory):
+        """Bölümde daha önce yazılmış parçaların şeması bu sink'inkiyle aynı olmalı"""
+        for parent, _, files in os.walk(directory):
+            for name in files:
+                if not name.endswith('.parquet'):
+                    continue
+                path = os.path.join(parent, name)
+                existing = pq.read_schema(path).remove_metadata()
+                if not existing.equals(self.arrow_schema):
+                    raise ValueError(
+                        f"{path} şeması farklı; farklı şemalı parçalar aynı bölüme eklenmez "
+                        f"(bölümü silin ya da append=False kullanın)\n"
+                        f"mevcut: {existing}\nbeklenen: {self.arrow_schema}")
+
+    def write_rows(self, rows):
+        self.rows.extend(rows)
+        if len(self.rows) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        df = pd.DataFrame(self.rows, columns=self.headers)
+        self.rows = []
+        write_parquet(df, self.program_turu, self.puan_turu, self.root, replace=False,
+                      arrow_schema=self.arrow_schema)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,234 @@
+"""İstek, ayrıştırma ve yazma süreleri için hafif ölçüm katmanı.
+
+Kazıyıcılar ortak `METRICS` nesnesine yazar: istek başına bağlantı (DNS dahil),
+ilk bayt (TTFB) ve indirme süresi, boyut, durum kodu ve tekrar denemeler;
+ayrıştırıcı ve çıktı hedefi başına süreler. Değerler sabit kovalı
+histogramlarda toplanır, en yavaş istekler URL'leriyle ayrıca tutulur.
+
+Çalıştırma sonunda export_metrics() sonuçları YOKATLAS_METRICS ile verilen
+dosyaya yazar: '.prom' uzantılıysa Prometheus metin biçimi (node_exporter
+textfile collector), değilse JSON özeti. ProcessPoolExecutor işçilerindeki
+ayrıştırma süreleri ana sürece taşınmaz.
+"""
+
+import bisect
+import heapq
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+
+SLOWEST_REQUESTS = 20
+
+
+def page_label(url):
+    """'https://.../content/lisans-dynamic/1000_1.php?y=1' -> '1000_1.php'"""
+    return os.path.basename(urlsplit(url).path) or '/'
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Değerin düştüğü kovanın üst sınırı (son kovada gözlenen en büyük değer)"""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (self.max,), self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    def __init__(self, slowest=SLOWEST_REQUESTS):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.seen_urls = set()
+        self.slowest = []
+        self.slowest_size = slowest
+        self.started = time.time()
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(
+                    BYTES_BUCKETS if name.endswith('_bytes') else SECONDS_BUCKETS)
+            histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def record_request(self, url, status_code, seconds, size=None, connect=None, ttfb=None, download=None,
+                       dns=None, page=None):
+        """Ağa çıkan bir isteği kaydeder; status_code None ise bağlantı hatası
+
+        Aynı URL'nin çalıştırma içinde ikinci kez istenmesi tekrar deneme sayılır.
+        page verilmezse etiket URL'deki dosya adıdır.
+        """
+        page = page or page_label(url)
+        with self.lock:
+            retry = url in self.seen_urls
+            self.seen_urls.add(url)
+            entry = (seconds, url, status_code)
+            if len(self.slowest) < self.slowest_size:
+                heapq.heappush(self.slowest, entry)
+            elif seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+        self.inc('yokatlas_requests_total', page=page, status=str(status_code or 'error'))
+        if retry:
+            self.inc('yokatlas_request_retries_total', page=page)
+        self.observe('yokatlas_request_seconds', seconds, page=page)
+        for name, value in (('dns', dns), ('connect', connect), ('ttfb', ttfb), ('download', download)):
+            if value is not None:
+                self.observe(f'yokatlas_request_{name}_seconds', value, page=page)
+        if size is not None:
+            self.observe('yokatlas_response_bytes', size, page=page)
+
+    def cache_hit(self, url):
+        self.inc('yokatlas_cache_hits_total', page=page_label(url))
+
+    def summary(self):
+        """JSON'a yazılabilir özet: histogramlar için adet, toplam, ortalama, p50/p90/p99, en büyük"""
+        with self.lock:
+            histograms = {}
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                histograms.setdefault(name, []).append({
+                    'labels': dict(labels),
+                    'count': histogram.count,
+                    'sum': round(histogram.sum, 6),
+                    'mean': round(histogram.sum / histogram.count, 6),
+                    'p50': round(histogram.quantile(0.5), 6),
+                    'p90': round(histogram.quantile(0.9), 6),
+                    'p99': round(histogram.quantile(0.99), 6),
+                    'max': round(histogram.max, 6),
+                })
+            counters = {}
+            for (name, labels), value in sorted(self.counters.items()):
+                counters.setdefault(name, []).append({'labels': dict(labels), 'value': value})
+            slowest = [{'url': url, 'seconds': round(seconds, 4), 'status': status_code}
+                       for seconds, url, status_code in sorted(self.slowest, reverse=True)]
+        return {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'duration_s': round(time.time() - self.started, 3),
+            'histograms': histograms,
+            'counters': counters,
+            'slowest_requests': slowest,
+        }
+
+    def prometheus(self):
+        """Prometheus metin biçimi (exposition format 0.0.4)"""
+        lines = []
+        with self.lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f'# TYPE {name} counter')
+                lines.append(f'{name}{_labels(labels)} {value}')
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f'# TYPE {name} histogram')
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(labels + (("le", repr(float(bound))),))} {cumulative}')
+                lines.append(f'{name}_bucket{_labels(labels + (("le", "+Inf"),))} {histogram.count}')
+                lines.append(f'{name}_sum{_labels(labels)} {histogram.sum}')
+                lines.append(f'{name}_count{_labels(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # textfile collector yarım dosya okumasın diye önce geçici dosyaya yazılır
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            if path.endswith('.prom'):
+                f.write(self.prometheus())
+            else:
+                json.dump(self.summary(), f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + '}'
+
+
+class HttpxTrace:
+    """httpx `trace` uzantısı: bağlantı, TTFB ve indirme sürelerini olay zamanlarından çıkarır
+
+    Bağlantı havuzundan yeniden kullanılan isteklerde bağlantı süresi yoktur (None).
+    """
+
+    def __init__(self):
+        self.events = {}
+
+    async def __call__(self, event_name, info):
+        # 'http11.' / 'http2.' öneki atılır; HTTP sürümünden bağımsız olay adları
+        prefix, _, rest = event_name.partition('.')
+        self.events[rest if prefix.startswith('http') else event_name] = time.perf_counter()
+
+    def between(self, start, end):
+        if start in self.events and end in self.events:
+            return self.events[end] - self.events[start]
+        return None
+
+    def phases(self):
+        connected = 'connection.connect_tcp.complete'
+        if 'connection.start_tls.complete' in self.events:
+            connected = 'connection.start_tls.complete'
+        return {
+            'connect': self.between('connection.connect_tcp.started', connected),
+            'ttfb': self.between('send_request_headers.started', 'receive_response_headers.complete'),
+            'download': self.between('receive_response_headers.complete', 'receive_response_body.complete'),
+        }
+
+
+# Tüm kazıyıcıların paylaştığı ölçüm nesnesi
+METRICS = Metrics()
+
+
+def export_metrics(path=None):
+    """Ölçümleri `path`e (verilmezse YOKATLAS_METRICS) yazar; hedef yoksa bir şey yapmaz"""
+    path = path or os.environ.get('YOKATLAS_METRICS')
+    if not path:
+        return None
+    METRICS.export(path)
+    print(f"✓ Ölçümler: {path}")
+    return path
@@ -0,0 +1,89 @@
+"""Türkçe biçimli puan/net sütunlarının sayısal tiplere dönüştürülmesi.
+
+YÖK Atlas tablolarında sayılar ondalık virgül ve binlik noktayla ('1.234',
+'452,10') gelir, boş hücreler '---' ya da 'Dolmadı' yazar. normalize_frame()
+şemadaki sütunları toplu halde (vektörel) float64 / Int32'ye çevirir; boş
+işaretleri NA olur. Binlik nokta yalnızca tam sayı (Int32) sütunlarında ya da
+değerde virgül de varsa aranır; puan sütunlarında '85.125' 85,125 okunur. Puanlar 5 ondalıklı ve 500 civarında olduğundan float32'nin
+~7 anlamlı basamağı yetmez.
+"""
+
+import re
+
+import pandas as pd
+
+# Boş sayılan hücre değerleri
+NA_MARKERS = ('', '-', '--', '---', 'Dolmadı')
+
+# Binlik noktalı tam sayı: '1.234', '12.345.678' (yalnızca thousands=True iken)
+THOUSANDS_PATTERN = r'-?\d{1,3}(?:\.\d{3})+'
+
+# Şema: (sütun adı deseni, tip) listesi; ilk eşleşen desen geçerli
+ONLISANS_SCHEMA = (
+    (re.compile(r'^Yılı?$'), 'Int32'),
+    (re.compile(r'^Yerleşen$'), 'Int32'),
+    (re.compile(r'Kontenjan|Sıra'), 'Int32'),
+    (re.compile(r'^Katsayı$'), 'float64'),
+    (re.compile(r'OBP'), 'float64'),
+    (re.compile(r'Puanı?$'), 'float64'),
+    (re.compile(r'^TYT '), 'float64'),
+)
+
+LISANS_SCHEMA = ONLISANS_SCHEMA + (
+    (re.compile(r'^(AYT|YDT) '), 'float64'),
+)
+
+
+def parse_turkish_number(values, thousands=False):
+    """'1.234,5' / '35,25' / '---' biçimindeki seriyi sayıya çevirir; çevrilemeyenler NA
+
+    Virgüllü değerlerde nokta binlik ayırıcıdır. Virgülsüz değerde nokta ondalıktır
+    ('85.125' -> 85.125); thousands=True ise (Kontenjan, Sıra gibi tam sayı sütunları)
+    binlik düzenindeki nokta atılır ('1.234' -> 1234).
+    """
+    text = values.astype('string').str.strip()
+    text = text.mask(text.isin(NA_MARKERS))
+    grouped = text.str.contains(',', regex=False).fillna(False).astype(bool)
+    if thousands:
+        grouped |= text.str.fullmatch(THOUSANDS_PATTERN).fillna(False).astype(bool)
+    text = text.where(~grouped, text.str.replace('.', '', regex=False))
+    text = text.str.replace(',', '.', regex=False)
+    return pd.to_numeric(text, errors='coerce')
+
+
+def is_missing(values):
+    return values.isna() | values.astype('string').str.strip().isin(NA_MARKERS)
+
+
+def column_dtype(column, schema):
+    for pattern, dtype in schema:
+        if pattern.search(str(column)):
+            return dtype
+    return None
+
+
+def convert_column(values, dtype):
+    """Sütunu verilen tipe çevirir; boş işareti dışında sayı olmayan değer varsa None"""
+    numbers = parse_turkish_number(values, thousands=dtype == 'Int32')
+    if numbers.notna().sum() != (~is_missing(values)).sum():
+        return None
+    if dtype == 'Int32' and not (numbers.dropna() % 1 == 0).all():
+        dtype = 'float64'
+    return numbers.astype(dtype)
+
+
+def normalize_frame(df, schema=LISANS_SCHEMA):
+    """Şemadaki metin sütunlarını sayısal tiplere çevirilmiş yeni DataFrame döndürür
+
+    Sayı olmayan değer içeren sütunlar (beklenmedik sayfa yapısı) olduğu gibi bırakılır.
+    """
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        dtype = column_dtype(column, schema)
+        if dtype is not None and (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+            converted = convert_column(values, dtype)
+            if converted is not None:
+                values = converted
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index)
@@ -0,0 +1,210 @@
+"""Sayfa ayrıştırıcıları.
+
+Buradaki fonksiyonlar modül seviyesinde ve yalnızca bytes/str alıp basit
+tuple/list döndürdüğü için ProcessPoolExecutor işçilerine gönderilebilir.
+"""
+
+import hashlib
+import html
+import re
+import time
+from collections import namedtuple
+
+from bs4 import BeautifulSoup
+
+from yokatlas_common.metrics import METRICS
+
+EMPTY_HEADERS = ('', ' ', '\xa0', '&nbsp;')
+
+UNIVERSITY_CODE_RE = re.compile(r'y=(\d+)')
+
+MYDATA_BLOCK_RE = re.compile(rb'<table[^>]*\bid=["\']?mydata\b.*?</table>', re.S | re.I)
+
+TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.S | re.I)
+
+# headers: thead'in ilk satırındaki <th> yazıları
+# header_row_count: thead içindeki <tr> sayısı
+# rows: gövde satırlarının <td> yazıları (tbody yoksa thead dışındaki tüm <tr>'ler)
+# links: rows ile aynı şekilde; hücrede <a> varsa (href, link yazısı), yoksa None
+MydataTable = namedtuple('MydataTable', 'headers header_row_count rows links')
+
+
+def extract_university_code(href):
+    """lisans.php?y=103390230 veya onlisans.php?y=101051376 formatından kodu çeker"""
+    match = UNIVERSITY_CODE_RE.search(href or '')
+    return match.group(1) if match else ''
+
+
+def mydata_digest(content):
+    """`table#mydata` bloğunun SHA-256 özetini DOM kurmadan hesaplar; tablo yoksa None"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    match = MYDATA_BLOCK_RE.search(content)
+    return hashlib.sha256(match.group(0)).hexdigest() if match else None
+
+
+def extract_title(content, encoding='utf-8'):
+    """`<title>` yazısını DOM kurmadan çıkarır; başlık yoksa None"""
+    if isinstance(content, str):
+        content = content.encode(encoding)
+    match = TITLE_RE.search(content)
+    if not match:
+        return None
+    return html.unescape(match.group(1).decode(encoding, errors='replace')).strip()
+
+
+def _cell_link_lxml(td):
+    link = td.find('.//a')
+    if link is None:
+        return None
+    return link.get('href', ''), link.text_content().strip()
+
+
+def _extract_mydata_lxml(content, encoding):
+    from lxml import html as lxml_html
+
+    if isinstance(content, bytes):
+        root = lxml_html.fromstring(content, parser=lxml_html.HTMLParser(encoding=encoding))
+    else:
+        root = lxml_html.fromstring(content)
+
+    tables = root.xpath('//table[@id="mydata"]')
+    if not tables:
+        return None
+    table = tables[0]
+
+    headers = []
+    header_rows = []
+    thead = table.find('thead')
+    if thead is not None:
+        header_rows = thead.findall('tr')
+        if header_rows:
+            headers = [th.text_content().strip() for th in header_rows[0].findall('th')]
+
+    tbody = table.find('tbody')
+    if tbody is not None:
+        body_rows = tbody.findall('tr')
+    else:
+        body_rows = [tr for tr in table.iter('tr') if tr not in header_rows]
+
+    rows = []
+    links = []
+    for tr in body_rows:
+        cells = tr.findall('td')
+        rows.append([td.text_content().strip() for td in cells])
+        links.append([_cell_link_lxml(td) for td in cells])
+
+    return MydataTable(headers, len(header_rows), rows, links)
+
+
+def _cell_link_bs4(td):
+    link = td.find('a')
+    if link is None:
+        return None
+    return link.get('href', ''), link.text.strip()
+
+
+def _extract_mydata_bs4(content):
+    soup = BeautifulSoup(content, 'html.parser')
+
+    table = soup.find('table', {'id': 'mydata'})
+    if not table:
+        return None
+
+    headers = []
+    header_rows = []
+    thead = table.find('thead')
+    if thead:
+        header_rows = thead.find_all('tr')
+        if header_rows:
+            headers = [th.text.strip() for th in header_rows[0].find_all('th')]
+
+    tbody = table.find('tbody')
+    if tbody:
+        body_rows = tbody.find_all('tr')
+    else:
+        body_rows = [tr for tr in table.find_all('tr') if tr.find_parent('thead') is None]
+
+    rows = []
+    links = []
+    for tr in body_rows:
+        cells = tr.find_all('td')
+        rows.append([td.text.strip() for td in cells])
+        links.append([_cell_link_bs4(td) for td in cells])
+
+    return MydataTable(headers, len(header_rows), rows, links)
+
+
+def extract_mydata_table(html_bytes, encoding='utf-8'):
+    """`table#mydata` tablosunu tek geçişte MydataTable olarak çıkarır; tablo yoksa None
+
+    lxml'in C ayrıştırıcısıyla çalışır; lxml yüklü değilse ya da ayrıştırma hata
+    verirse BeautifulSoup'a düşer. Süre METRICS'e kullanılan ayrıştırıcıyla yazılır.
+    """
+    start = time.perf_counter()
+    try:
+        table = _extract_mydata_lxml(html_bytes, encoding)
+        parser = 'mydata-lxml'
+    except Exception:
+        table = _extract_mydata_bs4(html_bytes)
+        parser = 'mydata-bs4'
+    METRICS.observe('yokatlas_parse_seconds', time.perf_counter() - start, parser=parser)
+    return table
+
+
+def parse_netler_table(content, program_type='lisans'):
+    """netler-tablo / netler-onlisans-tablo sayfasını (headers, rows) olarak döndürür
+
+    rows tuple listesidir; ikinci sütuna üniversite kodu eklenmiştir. Tablo ya da
+    veri yoksa None döner.
+    """
+    table = extract_mydata_table(content)
+    if table is None:
+        return None
+
+    # Başlıkları al
+    headers = []
+    th_texts = table.headers
+    for idx, header_text in enumerate(th_texts):
+        # Boş başlıkları kontrol et
+        if header_text in EMPTY_HEADERS:
+            # Önlisans için "TYT 0,12 Katsayı ile Yerleşen Son Kişinin Puanı"
+            # Lisans için "0.12 Katsayı ile Yerleşen Son Kişinin Puanı"
+            prev_text = th_texts[idx-1] if idx > 0 else ''
+            if 'Yerleşen Son Kişi' in prev_text or 'Ortaöğretim' in prev_text:
+                if program_type == 'onlisans':
+                    header_text = 'TYT 0.12 Katsayı ile Yerleşen Son Kişinin Puanı'
+                else:
+                    header_text = '0.12 Katsayı ile Yerleşen Son Kişinin Puanı'
+            else:
+                header_text = f'Boş_Sütun_{idx}'
+
+        # Eğer aynı isimli sütun varsa, sonuna sayı ekle
+        original_header = header_text
+        counter = 1
+        while header_text in headers:
+            header_text = f"{original_header}_{counter}"
+            counter += 1
+
+        headers.append(header_text)
+
+    # Satırları al
+    rows = []
+    for cells, cell_links in zip(table.rows, table.links):
+        if len(cells) <= 1:  # Boş satırları atla
+            continue
+
+        # Link içindeki metni al
+        row_data = [link[1] if link else text for text, link in zip(cells, cell_links)]
+
+        # İkinci sütun genelde üniversite linki, ondan kodu çek
+        university_code = extract_university_code(cell_links[1][0]) if cell_links[1] else ''
+        row_data.insert(1, university_code)
+        rows.append(tuple(row_data))
+
+    if not rows:
+        return headers, []
+
+    # Üniversite Kodu başlığını ekle
+    headers.insert(1, 'Üniversite Kodu')
+    return headers, rows
@@ -0,0 +1,163 @@
+"""Host başına token-bucket hız sınırlayıcı.
+
+Tüm kazıyıcılar istekten önce `LIMITER.wait(url)` (veya async `wait_async`) çağırır,
+yanıttan sonra durum kodunu `LIMITER.report(...)` ile bildirir. 429/5xx geldiğinde
+host'un hızı yarıya iner, başarılı yanıtlarla yavaşça ayarlanan hıza geri döner.
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from yokatlas_common.metrics import METRICS, HttpxTrace
+
+DEFAULT_RATE = 5.0   # saniyede istek
+DEFAULT_BURST = 10   # art arda gönderilebilecek istek sayısı
+MIN_RATE = 0.25
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Bir jeton ayırır, isteğin gönderilmesi için beklenmesi gereken süreyi döndürür"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def slow_down(self, retry_after=None):
+        """Sunucu zorlandığında hızı yarıya indirir"""
+        with self.lock:
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    def recover(self):
+        """Başarılı yanıtta hızı ayarlanan değere doğru artırır"""
+        with self.lock:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+
+
+class RateLimiter:
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst)
+            return self.buckets[host]
+
+    def wait(self, url):
+        delay = self.bucket(url).reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url):
+        delay = self.bucket(url).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def report(self, url, status_code, retry_after=None):
+        """Yanıt durumunu bildirir; status_code None ise bağlantı hatası sayılır"""
+        bucket = self.bucket(url)
+        if status_code is None or status_code == 429 or status_code >= 500:
+            bucket.slow_down(parse_retry_after(retry_after))
+        else:
+            bucket.recover()
+
+
+def parse_retry_after(value):
+    """Retry-After başlığını saniyeye çevirir: '120' ya da HTTP tarihi"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Tüm kazıyıcıların paylaştığı sınırlayıcı
+LIMITER = RateLimiter()
+
+
+# polite_get'in yeniden denediği durum kodları (çok fazla istek / sunucu hatası)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRIES = 2
+
+
+def finish_attempt(url, limiter, response, seconds, **phases):
+    """Denemenin ölçümünü yazar, durumu sınırlayıcıya bildirir; tekrar denenecekse True"""
+    if response is None:
+        METRICS.record_request(url, None, seconds, **phases)
+        limiter.report(url, None)
+        return False
+    METRICS.record_request(url, response.status_code, seconds, size=len(response.content), **phases)
+    limiter.report(url, response.status_code, response.headers.get('Retry-After'))
+    return response.status_code in RETRY_STATUSES
+
+
+def polite_get(get, url, limiter=None, retries=RETRIES, **kwargs):
+    """`get(url, **kwargs)` çağrısını hız sınırlayıcıdan geçirir (requests.get, session.get vb.)
+
+    429/5xx yanıtında en fazla `retries` kez yeniden dener; her deneme sınırlayıcıyı
+    bekler, yani yavaşlama ve Retry-After süresi tekrar denemeleri de kapsar.
+    İstek süresi METRICS'e yazılır; requests'te TTFB `response.elapsed`, indirme kalanıdır.
+    """
+    limiter = limiter or LIMITER
+    for _ in range(retries + 1):
+        limiter.wait(url)
+        start = time.perf_counter()
+        try:
+            response = get(url, **kwargs)
+        except Exception:
+            finish_attempt(url, limiter, None, time.perf_counter() - start)
+            raise
+        seconds = time.perf_counter() - start
+        elapsed = getattr(response, 'elapsed', None)
+        ttfb = elapsed.total_seconds() if elapsed is not None else None
+        if not finish_attempt(url, limiter, response, seconds, ttfb=ttfb,
+                              download=max(0.0, seconds - ttfb) if ttfb is not None else None):
+            break
+    return response
+
+
+async def polite_get_async(get, url, limiter=None, retries=RETRIES, **kwargs):
+    """polite_get'in httpx.AsyncClient.get için olanı; aynı tekrar deneme ve bildirim
+
+    Süre aşamaları (bağlantı, TTFB, indirme) her denemede HttpxTrace ile ölçülür.
+    """
+    limiter = limiter or LIMITER
+    for _ in range(retries + 1):
+        await limiter.wait_async(url)
+        trace = HttpxTrace()
+        start = time.perf_counter()
+        try:
+            response = await get(url, extensions={'trace': trace}, **kwargs)
+        except Exception:
+            finish_attempt(url, limiter, None, time.perf_counter() - start, **trace.phases())
+            raise
+        if not finish_attempt(url, limiter, response, time.perf_counter() - start, **trace.phases()):
+            break
+    return response
@@ -0,0 +1,323 @@
+"""Akış halinde yazan çıktı hedefleri."""
+
+import csv
+import os
+import time
+
+import pandas as pd
+import xlsxwriter
+from openpyxl import Workbook, load_workbook
+
+from yokatlas_common.metrics import METRICS
+
+
+class TableSink:
+    """CSV ve Excel dosyasını açık tutar, satırları geldikçe ekler, Excel'i sonda bir kez kaydeder
+
+    Excel, openpyxl write-only modunda yazılır: satırlar bellekte birikmez ve her
+    ekleme O(satır) maliyetlidir. append=True ise mevcut dosyaların devamına yazılır.
+    parquet verilirse (ör. columnar.ParquetSink) aynı satırlar ona da aktarılır.
+    """
+
+    def __init__(self, csv_path, excel_path, headers, append=False, encoding='utf-8', sheet_name='Sheet1',
+                 parquet=None):
+        self.csv_path = csv_path
+        self.excel_path = excel_path
+        self.headers = list(headers)
+        self.parquet = parquet
+        self.row_count = 0
+
+        for path in (csv_path, excel_path):
+            if path and os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        csv_exists = append and os.path.exists(csv_path)
+        self.csv_file = open(csv_path, 'a' if csv_exists else 'w', newline='', encoding=encoding)
+        self.csv_writer = csv.writer(self.csv_file)
+        if not csv_exists:
+            self.csv_writer.writerow(self.headers)
+
+        self.workbook = None
+        if excel_path:
+            self.workbook = Workbook(write_only=True)
+            self.worksheet = self.workbook.create_sheet(sheet_name)
+            if append and os.path.exists(excel_path):
+                # Önceki çalıştırmanın satırları bir kez kopyalanır
+                existing = load_workbook(excel_path, read_only=True)
+                for row in existing.active.iter_rows(values_only=True):
+                    self.worksheet.append(row)
+                existing.close()
+            else:
+                self.worksheet.append(self.headers)
+
+    def write_rows(self, rows):
+        with METRICS.timer('yokatlas_write_seconds', sink='table'):
+            for row in rows:
+                self.csv_writer.writerow(row)
+                if self.workbook is not None:
+                    self.worksheet.append(row)
+                self.row_count += 1
+            self.csv_file.flush()
+        METRICS.inc('yokatlas_rows_written_total', len(rows), sink='table')
+        if self.parquet is not None:
+            self.parquet.write_rows(rows)
+
+    def close(self):
+        if self.csv_file.closed:
+            return
+        self.csv_file.close()
+        if self.workbook is not None:
+            with METRICS.timer('yokatlas_write_seconds', sink='xlsx'):
+                self.workbook.save(self.excel_path)
+        if self.parquet is not None:
+            self.parquet.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _excel_column(values):
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def write_excel(df, path, sheet_name='Sheet1', min_width=10, max_width=50):
+    """DataFrame'i xlsxwriter constant_memory modunda tek geçişte Excel'e yazar
+
+    Satırlar sırayla diske akar; biçimler hücre başına değil sütun başına verilir ve
+    sütun genişlikleri DataFrame üzerinden (str.len().max()) hesaplanır.
+    """
+    with METRICS.timer('yokatlas_write_seconds', sink='xlsx'):
+        _write_excel(df, path, sheet_name, min_width, max_width)
+    METRICS.inc('yokatlas_rows_written_total', len(df), sink='xlsx')
+
+
+def _write_excel(df, path, sheet_name, min_width, max_width):
+    workbook = xlsxwriter.Workbook(path, {
+        'constant_memory': True,
+        # Hücreler düz metin/sayı; URL ve formül taraması gereksiz
+        'strings_to_urls': False,
+        'strings_to_formulas': False,
+    })
+    worksheet = workbook.add_worksheet(sheet_name)
+
+    header_format = workbook.add_format({
+        'bold': True, 'font_color': '#FFFFFF', 'font_size': 11, 'bg_color': '#366092',
+        'align': 'center', 'valign': 'vcenter', 'text_wrap': True,
+    })
+    cell_format = workbook.add_format({'align': 'center', 'valign': 'vcenter'})
+
+    # Sütun genişlikleri: başlık ve değerlerin en uzunu + 2, [min_width, max_width] aralığında
+    lengths = df.astype('string').apply(lambda column: column.str.len().max()).fillna(0)
+    for index, column in enumerate(df.columns):
+        width = max(int(lengths.iloc[index]), len(str(column))) + 2
+        worksheet.set_column(index, index, min(max(width, min_width), max_width), cell_format)
+
+    worksheet.write_row(0, 0, [str(column) for column in df.columns], header_format)
+    columns = [_excel_column(df[column]) for column in df.columns]
+    for row_index, row in enumerate(zip(*columns), 1):
+        worksheet.write_row(row_index, 0, row)
+
+    workbook.close()
+
+
+class BufferedRowSink:
+    """Tek bir CSV tanıtıcısını açık tutup satırları toplu yazan çıktı hedefi
+
+    Satırlar bellekte birikir; `flush_rows` satıra ya da son yazımdan bu yana
+    `flush_interval` saniyeye ulaşınca ve close() sırasında diske yazılır.
+
+    checkpoint_path verilirse write() ile gelen anahtarlar (ör. işlenen y kodları)
+    her flush'ta, veri fsync edildikten sonra checkpoint dosyasına eklenir ve
+    arkasına `#offset=<CSV boyu>` satırı yazılır. Açılışta son işaretten sonraki
+    anahtarlar yok sayılır ve CSV o boya kırpılır; böylece yarıda kalan bir
+    çalışma CSV ile checkpoint'i birbirinden koparmaz. İşaretsiz (eski) checkpoint
+    dosyalarındaki anahtarların hepsi tamamlanmış sayılır.
+    """
+
+    MARKER = '#offset='
+
+    def __init__(self, path, headers=None, encoding='utf-8', checkpoint_path=None,
+                 flush_rows=500, flush_interval=5.0):
+        self.path = path
+        self.checkpoint_path = checkpoint_path
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.processed = set()
+        self.row_count = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        committed_size = self._recover() if checkpoint_path else None
+        if committed_size is not None and os.path.exists(path) and os.path.getsize(path) > committed_size:
+            os.truncate(path, committed_size)
+
+        self.file = open(path, 'a', newline='', encoding=encoding)
+        self.writer = csv.writer(self.file)
+        self.checkpoint_file = open(checkpoint_path, 'a', encoding='utf-8') if checkpoint_path else None
+
+        self.rows = []
+        self.keys = []
+        self.last_flush = time.monotonic()
+
+        if headers is not None:
+            self.write_header(headers)
+        if self.checkpoint_file is not None and committed_size is None and self.processed:
+            # Eski biçimli dosyaya bir başlangıç işareti konur
+            self._commit()
+
+    def _recover(self):
+        """Checkpoint'i okur, işlenmiş anahtarları yükler ve son işaretteki CSV boyunu döndürür"""
+        if not os.path.exists(self.checkpoint_path):
+            return None
+
+        committed = set()
+        pending = set()
+        committed_size = None
+        committed_end = 0
+        with open(self.checkpoint_path, 'rb') as f:
+            for line in f:
+                text = line.decode('utf-8', errors='replace').strip()
+                if text.startswith(self.MARKER):
+                    committed |= pending
+                    pending = set()
+                    committed_size = int(text[len(self.MARKER):])
+                    committed_end = f.tell()
+                elif text:
+                    pending.add(text)
+
+        if committed_size is None:
+            # İşaretsiz eski biçim: tüm satırlar tamamlanmış sayılır
+            self.processed = pending
+            return None
+
+        self.processed = committed
+        if pending or os.path.getsize(self.checkpoint_path) > committed_end:
+            os.truncate(self.checkpoint_path, committed_end)
+        return committed_size
+
+    def size(self):
+        """CSV'nin diske yazılmış bayt boyu"""
+        return os.fstat(self.file.fileno()).st_size
+
+    @property
+    def needs_header(self):
+        return self.size() == 0 and not self.rows
+
+    def write_header(self, headers):
+        """Dosya boşsa başlık satırını yazar"""
+        if self.needs_header:
+            self.rows.append(list(headers))
+
+    def write(self, row, key=None):
+        self.rows.append(row)
+        if key is not None:
+            self.keys.append(key)
+            self.processed.add(key)
+        self.row_count += 1
+        if len(self.rows) >= self.flush_rows or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def write_rows(self, rows, key=None):
+        """Satırları tek kayıt olarak ekler; araya flush girmez, anahtar en sonda işlenir"""
+        self.rows.extend(rows)
+        if key is not None:
+            self.keys.append(key)
+            self.processed.add(key)
+        self.row_count += len(rows)
+        if len(self.rows) >= self.flush_rows or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if not self.rows and not self.keys:
+            return
+        METRICS.inc('yokatlas_rows_written_total', len(self.rows), sink='csv')
+        with METRICS.timer('yokatlas_write_seconds', sink='csv'):
+            self.writer.writerows(self.rows)
+            self.rows = []
+            self.file.flush()
+            if self.checkpoint_file is not None:
+                os.fsync(self.file.fileno())
+                self._commit()
+        self.last_flush = time.monotonic()
+
+    def _commit(self):
+        for key in self.keys:
+            self.checkpoint_file.write(f'{key}\n')
+        self.keys = []
+        self.checkpoint_file.write(f'{self.MARKER}{self.size()}\n')
+        self.checkpoint_file.flush()
+        os.fsync(self.checkpoint_file.fileno())
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+        if self.checkpoint_file is not None:
+            self.checkpoint_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LongFormatSink:
+    """Alanları sayfadan sayfaya değişen kayıtları uzun biçimde (kimlik..., key, value) yazar
+
+    Her alan ayrı satır olduğu için başlık hiç değişmez; görülen alan adları
+    sırasıyla `columns` kaydında tutulur. Geniş tablo sonda to_wide() ile tek
+    seferde kurulur. Satırlar BufferedRowSink'ten geçer; checkpoint_path verilirse
+    bir kaydın bütün satırları ve anahtarı birlikte işlenir.
+    """
+
+    def __init__(self, path, id_columns, encoding='utf-8', checkpoint_path=None, **buffer_options):
+        self.path = path
+        self.encoding = encoding
+        self.id_columns = list(id_columns)
+        self.sink = BufferedRowSink(path, headers=self.id_columns + ['key', 'value'], encoding=encoding,
+                                    checkpoint_path=checkpoint_path, **buffer_options)
+        self.processed = self.sink.processed
+
+        # Önceki çalıştırmanın alanları kayda ilk görülme sırasıyla alınır
+        self.columns = {}
+        if self.sink.size() > 0:
+            for chunk in pd.read_csv(path, usecols=['key'], dtype=str, keep_default_na=False,
+                                     encoding=encoding, chunksize=100_000):
+                for name in chunk['key'].unique():
+                    self.columns.setdefault(name, len(self.columns))
+
+    def write_record(self, ids, fields, key=None):
+        ids = list(ids)
+        rows = []
+        for name, value in fields.items():
+            self.columns.setdefault(name, len(self.columns))
+            rows.append(ids + [name, value])
+        if not rows:
+            # Alanı olmayan kayıt da geniş tabloda satır olarak kalsın
+            rows.append(ids + ['', ''])
+        self.sink.write_rows(rows, key)
+
+    def close(self):
+        self.sink.close()
+
+    def to_wide(self, wide_path, encoding=None):
+        """Uzun dosyayı kimlik sütunları + kayıttaki alanlar düzeninde geniş CSV'ye çevirir"""
+        self.close()
+        long = pd.read_csv(self.path, dtype=str, keep_default_na=False, encoding=self.encoding)
+
+        # Aynı sayfada tekrarlanan alanlarda son değer geçerli
+        long = long.drop_duplicates(self.id_columns + ['key'], keep='last')
+        order = pd.MultiIndex.from_frame(long[self.id_columns].drop_duplicates())
+        columns = [name for name in self.columns if name and name not in self.id_columns]
+
+        wide = long[long['key'] != ''].pivot(index=self.id_columns, columns='key', values='value')
+        wide = wide.reindex(index=order, columns=columns).reset_index()
+        wide.to_csv(wide_path, index=False, na_rep='', encoding=encoding or self.encoding)
+        print(f"✓ {wide_path}: {len(wide)} satır, {len(wide.columns)} sütun")
+        return wide
@@ -0,0 +1,74 @@
+"""Üniversite y kodu indeksi.
+
+Aynı `1000_1.php?y=` sayfası birden çok bölüm listesinde geçebilir. İndeks hangi
+programın hangi y koduna baktığını (referanslar) ve her y kodunun ayrıştırılmış
+detaylarını tutar; böylece bir detay sayfası çalıştırma başına en fazla bir kez
+indirilip ayrıştırılır. path verilirse her şey SQLite'ta saklanır ve `max_age`
+saniyeden yeni detaylar sonraki çalıştırmalarda da yeniden çekilmez.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from yokatlas_common.cache import DEFAULT_TTL
+
+
+class YCodeIndex:
+    def __init__(self, path=':memory:', max_age=DEFAULT_TTL):
+        self.path = path
+        self.max_age = max_age
+        self.claimed = set()
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS refs ('
+                'y_code TEXT, program_code TEXT, PRIMARY KEY (y_code, program_code))'
+            )
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS details (y_code TEXT PRIMARY KEY, details TEXT, saved_at REAL)'
+            )
+
+    def add_references(self, program_code, y_codes):
+        """Programın listelediği y kodlarını kaydeder"""
+        with self.lock, self.conn:
+            self.conn.executemany('INSERT OR IGNORE INTO refs (y_code, program_code) VALUES (?, ?)',
+                                  [(str(y_code), str(program_code)) for y_code in y_codes])
+
+    def programs(self, y_code):
+        """y koduna bakan program kodları"""
+        with self.lock:
+            return [row[0] for row in self.conn.execute(
+                'SELECT program_code FROM refs WHERE y_code = ? ORDER BY program_code', (str(y_code),))]
+
+    def claim(self, y_code):
+        """y kodu bu çalıştırmada ilk kez isteniyorsa True (çekme işi çağırana düşer)"""
+        with self.lock:
+            if y_code in self.claimed:
+                return False
+            self.claimed.add(y_code)
+            return True
+
+    def stored(self, y_code):
+        """Kayıtlı ve `max_age`den yeni detaylar; yoksa None"""
+        with self.lock:
+            row = self.conn.execute('SELECT details, saved_at FROM details WHERE y_code = ?',
+                                    (str(y_code),)).fetchone()
+        if row is None or (self.max_age is not None and time.time() - row[1] > self.max_age):
+            return None
+        return json.loads(row[0])
+
+    def save(self, y_code, details):
+        with self.lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO details (y_code, details, saved_at) VALUES (?, ?, ?)',
+                              (str(y_code), json.dumps(details, ensure_ascii=False), time.time()))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()